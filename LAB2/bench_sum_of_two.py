@@ -0,0 +1,49 @@
+"""
+Timing of sum_of_two against sum_of_two_parallel on one large input.
+
+The only pair is placed at the end, so both scan everything:
+
+    python bench_sum_of_two.py --size 5000000 --workers 4
+"""
+import argparse
+import os
+import random
+import time
+from sum_of_two import sum_of_two, sum_of_two_parallel
+
+def make_input(size, seed=0):
+    """Even values and an odd target, so the only pair is the one appended at the end."""
+    rng = random.Random(seed)
+    target = 40 * size + 1
+    nums = [2 * v for v in rng.sample(range(size * 10), size - 2)]
+    nums += [1, target - 1]
+    return nums, target
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time sum_of_two against sum_of_two_parallel.")
+    parser.add_argument("--size", type=int, default=5_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    import numpy as np
+
+    nums, target = make_input(args.size)
+    array = np.array(nums, dtype=np.int64)
+    sequential, expected = timed(sum_of_two, nums, target)
+    from_list, result = timed(sum_of_two_parallel, nums, target, args.workers, 0)
+    assert result == expected, (result, expected)
+    from_array, result = timed(sum_of_two_parallel, array, target, args.workers, 0)
+    assert result == expected, (result, expected)
+
+    print(f"n={args.size} workers={args.workers} pair={expected}")
+    print(f"{'sum_of_two':32} {sequential:8.3f} s")
+    print(f"{'sum_of_two_parallel (list)':32} {from_list:8.3f} s  x{sequential / from_list:.1f}")
+    print(f"{'sum_of_two_parallel (ndarray)':32} {from_array:8.3f} s  x{sequential / from_array:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,12 @@
+import mmap
+import multiprocessing
+import os
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice, repeat
+
 def sum_of_two(nums, target):
     seen = {}
     for i, num in enumerate(nums):
@@ -5,4 +14,402 @@ def sum_of_two(nums, target):
         if need in seen:
             return [seen[need], i]
         seen[num] = i
-    return []
\ No newline at end of file
+    return []
+
+def _build_index(nums):
+    # positions: value -> ascending list of indices where it occurs
+    # events: (index, value) of the first and second occurrence of every value.
+    # Later occurrences can never be the first index to complete a pair,
+    # so the scan for a target only has to look at these events.
+    positions = {}
+    events = []
+    for i, num in enumerate(nums):
+        found = positions.get(num)
+        if found is None:
+            positions[num] = [i]
+            events.append((i, num))
+        else:
+            if len(found) == 1:
+                events.append((i, num))
+            found.append(i)
+    return positions, events
+
+def _find_in_index(positions, events, target):
+    for i, num in events:
+        found = positions.get(target - num)
+        if found is not None and found[0] < i:
+            # Same pair sum_of_two returns: the latest occurrence before i
+            return [found[bisect_left(found, i) - 1], i]
+    return []
+
+def _as_int64(np, nums, targets):
+    # nums as an int64 array, or None for non-integer values or when
+    # target - value could leave int64 for one of the targets
+    arr = np.asarray(nums)
+    if not len(arr) or not np.issubdtype(arr.dtype, np.integer) or arr.dtype == np.uint64:
+        return None
+    low, high = int(arr.min()), int(arr.max())
+    if not all(isinstance(t, (int, np.integer)) and -2 ** 63 <= t - high <= t - low < 2 ** 63
+               for t in targets):
+        return None
+    return arr.astype(np.int64, copy=False)
+
+def _build_sorted_index(np, arr):
+    # Levels for prefixes of arr growing 4x up to the whole of it: the
+    # distinct values occurring in the prefix in ascending order, with the
+    # index of their first and second occurrence (n if it is not in the
+    # prefix). Plus the stable argsort of arr and the start of every value's
+    # run in it, which lists the positions of each value in ascending order.
+    n = len(arr)
+    order = np.argsort(arr, kind="stable")
+    ordered = arr[order]
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1])))
+    values = ordered[starts]
+    first = order[starts]
+    counts = np.diff(np.append(starts, n))
+    second = np.where(counts > 1, order[np.minimum(starts + 1, n - 1)], n)
+    levels = []
+    size = 1024
+    while size < n:
+        seen = first < size
+        levels.append((size, values[seen], first[seen], np.where(second[seen] < size, second[seen], n)))
+        size *= 4
+    levels.append((n, values, first, second))
+    return levels, values, order, starts, counts
+
+def _find_in_level(np, values, first, second, target, n):
+    # Smallest index completing a pair within one level, n if there is none.
+    # Every pair {v, target - v} is seen once, from its smaller value.
+    low = int(np.searchsorted(values, target // 2, side="right"))
+    if low == 0:
+        return n
+    # Ascending complements, searchsorted is much faster on sorted keys
+    need = target - values[low - 1::-1]
+    pos = np.minimum(np.searchsorted(values, need), len(values) - 1)
+    hits = np.flatnonzero(values[pos] == need)
+    if not len(hits):
+        return n
+    matched = low - 1 - hits
+    other = pos[hits]
+    # The later first occurrence of two different values completes the pair,
+    # or the second occurrence of a value paired with itself
+    complete = np.where(matched == other, second[matched], np.maximum(first[matched], first[other]))
+    return int(complete.min())
+
+def _find_sorted(np, arr, index, target):
+    levels, values, order, starts, counts = index
+    n = len(arr)
+    # A pair completed inside a prefix only uses values seen in it, so the
+    # first level with a pair gives the smallest i
+    for size, *level in levels:
+        i = _find_in_level(np, *level, target, n)
+        if i < size:
+            break
+    else:
+        return []
+    # Same pair sum_of_two returns: the latest occurrence of the complement before i
+    g = int(np.searchsorted(values, target - arr[i]))
+    found = order[starts[g]:starts[g] + counts[g]]
+    return [int(found[np.searchsorted(found, i) - 1]), i]
+
+def sum_of_two_batch(nums, targets):
+    """
+    Answer sum_of_two(nums, target) for every target in targets.
+
+    The index is built once for all targets and repeated targets are
+    answered only once. With NumPy and integer values it is the sorted
+    distinct values with their first and second occurrences: a target is
+    resolved by one searchsorted of the complements of the values up to
+    target / 2, the pair completed at the smallest index is the answer.
+    The search runs over growing prefixes of nums first, so a target whose
+    pair is completed early costs only a fraction of the index.
+    Otherwise (no NumPy, other values, int64 overflow) a value -> positions
+    dict is scanned over the first/second occurrences of the values.
+    Results are the same pairs sum_of_two returns, in the order of targets.
+    """
+    targets = list(targets)
+    try:
+        import numpy as np
+    except ImportError:
+        arr = None
+    else:
+        arr = _as_int64(np, nums, targets)
+    if arr is not None:
+        index = _build_sorted_index(np, arr)
+        find = lambda target: _find_sorted(np, arr, index, target)
+    else:
+        positions, events = _build_index(nums)
+        find = lambda target: _find_in_index(positions, events, target)
+    answers = {}
+    result = []
+    for target in targets:
+        if target not in answers:
+            answers[target] = find(target)
+        result.append(list(answers[target]))
+    return result
+
+def _iter_chunks(nums, chunk_size):
+    if hasattr(nums, "__len__") and hasattr(nums, "__getitem__"):
+        # Sliceable inputs (memoryview, numpy.memmap) are read one window at a time
+        for start in range(0, len(nums), chunk_size):
+            yield nums[start:start + chunk_size]
+    else:
+        it = iter(nums)
+        while chunk := list(islice(it, chunk_size)):
+            yield chunk
+
+def sum_of_two_stream(nums, target, chunk_size=65536):
+    """
+    sum_of_two over an iterable consumed chunk by chunk.
+
+    nums may be any iterator, a memoryview or a numpy.memmap, only one
+    chunk of it is materialized as Python numbers at a time and the scan
+    stops at the first pair. The returned indices are global positions.
+    """
+    seen = {}
+    offset = 0
+    for chunk in _iter_chunks(nums, chunk_size):
+        if hasattr(chunk, "tolist"):
+            chunk = chunk.tolist()
+        for i, num in enumerate(chunk, offset):
+            need = target - num
+            if need in seen:
+                return [seen[need], i]
+            seen[num] = i
+        offset += len(chunk)
+    return []
+
+def sum_of_two_file(path, target, typecode="q", chunk_size=65536):
+    """
+    sum_of_two over a binary file of integers, read through mmap.
+
+    The file holds raw machine values of the given array/struct typecode
+    in native byte order (as written by array.tofile or ndarray.tofile).
+    """
+    size = os.path.getsize(path)
+    itemsize = array(typecode).itemsize
+    if size % itemsize:
+        raise ValueError(f"{path}: size {size} is not a multiple of the {itemsize}-byte "
+                         f"item size of typecode {typecode!r}")
+    if size == 0:
+        return []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm).cast(typecode)
+        try:
+            return sum_of_two_stream(view, target, chunk_size)
+        finally:
+            view.release()
+
+# Shared state of sum_of_two_parallel, inherited by the forked workers
+_shared = {}
+
+def _bucket_firsts(low, high):
+    # Distinct values in [low, high) with the index of their first
+    # occurrence, written to the shared buffers after the count of smaller
+    # values, so the buckets of all workers lie in sorted order
+    import numpy as np
+
+    nums = _shared["nums"]
+    inside = np.ones(len(nums), dtype=bool) if high is None else nums < high
+    offset = 0
+    if low is not None:
+        above = nums >= low
+        offset = len(nums) - int(np.count_nonzero(above))
+        inside &= above
+    index = np.flatnonzero(inside)
+    # return_index is the first occurrence, and index is ascending
+    values, first = np.unique(nums[index], return_index=True)
+    _shared["values"][offset:offset + len(values)] = values
+    _shared["first"][offset:offset + len(values)] = index[first]
+    return offset, len(values)
+
+def _splitters(np, arr, buckets):
+    # Bucket bounds at the quantiles of a strided sample, so that every
+    # bucket gets about the same number of values
+    sample = np.sort(arr[::max(1, len(arr) // (buckets * 4096))])
+    bounds = np.unique(sample[[len(sample) * b // buckets for b in range(1, buckets)]]).tolist()
+    return [None] + bounds, bounds + [None]
+
+def _shard_pair(start, stop, size, target):
+    # Smallest i of the shard whose complement occurs before it, as (j, i)
+    import numpy as np
+
+    nums = _shared["nums"]
+    values, first = _shared["values"][:size], _shared["first"][:size]
+    need = target - nums[start:stop]
+    pos = np.minimum(np.searchsorted(values, need), size - 1)
+    found = (values[pos] == need) & (first[pos] < np.arange(start, stop))
+    if not found.any():
+        return None
+    k = int(found.argmax())
+    i = start + k
+    # Same pair sum_of_two returns: the latest occurrence before i
+    return int(np.flatnonzero(nums[:i] == need[k])[-1]), i
+
+def sum_of_two_parallel(nums, target, workers=None, min_size=1_000_000):
+    """
+    sum_of_two with the work split over a process pool.
+
+    nums is converted to an int64 NumPy array (pass an ndarray to skip the
+    copy) that the forked workers inherit, so it is never pickled. First
+    the values are split into ranges at the quantiles of a sample: every
+    worker owns one range and writes its distinct values with their first
+    index to shared memory, in sorted order after the smaller ranges, so
+    the parent only closes the gaps between them. Then nums is split into
+    contiguous shards, every worker looks up the complements of its shard
+    in that table and returns only the first (j, i) pair it completes; the
+    pair of the lowest shard is the one sum_of_two returns. Inputs shorter
+    than min_size, a single worker, non-integer values, missing NumPy or
+    no fork use sum_of_two. A value range that holds most of the input
+    (e.g. one value repeated) is handled by one worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 2 or len(nums) < max(min_size, 2) or "fork" not in multiprocessing.get_all_start_methods():
+        return sum_of_two(nums, target)
+    try:
+        import numpy as np
+    except ImportError:
+        return sum_of_two(nums, target)
+    arr = _as_int64(np, nums, [target])
+    if arr is None:
+        return sum_of_two(nums, target)
+
+    n = len(arr)
+    size = -(-n // workers)
+    starts = list(range(0, n, size))
+    stops = [min(start + size, n) for start in starts]
+    lows, highs = _splitters(np, arr, workers)
+    # Anonymous mmaps are shared with the forked workers, not copied
+    buffers = [mmap.mmap(-1, n * 8) for _ in range(2)]
+    _shared.update(nums=arr, values=np.frombuffer(buffers[0], np.int64),
+                   first=np.frombuffer(buffers[1], np.int64))
+    try:
+        context = multiprocessing.get_context("fork")
+        with ProcessPoolExecutor(max_workers=len(starts), mp_context=context) as pool:
+            size = 0
+            for offset, count in pool.map(_bucket_firsts, lows, highs):
+                # Never behind size, so the runs move down in place
+                for name in ("values", "first"):
+                    _shared[name][size:size + count] = _shared[name][offset:offset + count]
+                size += count
+            for pair in pool.map(_shard_pair, starts, stops, repeat(size), repeat(target)):
+                if pair is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    return list(pair)
+    finally:
+        _shared.clear()
+    return []
+
+class PairSumIndex:
+    """
+    Incrementally maintained value -> indices map of sum_of_two.
+
+    Values get the index they were added at, removing a value does not
+    renumber the others. find_pair(target) returns the same pair
+    sum_of_two would return for the live values in index order.
+    A new target costs one pass over the distinct values. A found pair is
+    cached until one of its values is removed; a target without a pair
+    remembers how many indices it has checked, and its next query only
+    looks at the values added since then (removals cannot create a pair).
+    So add and remove are O(1) (plus the pairs a removal breaks), and
+    queries between appends cost O(appended values). At most max_targets
+    answers are kept, the least recently queried one is dropped first.
+    """
+
+    def __init__(self, nums=(), max_targets=1024):
+        self.max_targets = max_targets
+        self._positions = {}
+        self._values = []
+        self._count = 0
+        # target -> [j, i], or the number of indices checked without a pair
+        self._answers = OrderedDict()
+        self._by_index = {}
+        self.extend(nums)
+
+    def __len__(self):
+        return self._count
+
+    def add(self, value):
+        i = len(self._values)
+        self._values.append(value)
+        self._positions.setdefault(value, []).append(i)
+        self._count += 1
+        return i
+
+    def extend(self, values):
+        for value in values:
+            self.add(value)
+
+    def remove(self, value):
+        found = self._positions.get(value)
+        if not found:
+            raise ValueError(f"{value!r} is not in the index")
+        i = found.pop(0)
+        if not found:
+            del self._positions[value]
+        self._count -= 1
+        # Removing a value can only break pairs that use it
+        for target in list(self._by_index.get(i, ())):
+            self._drop(target)
+
+    def find_pair(self, target):
+        answer = self._answers.get(target)
+        if isinstance(answer, list):
+            self._answers.move_to_end(target)
+            return list(answer)
+        answer = self._search(target) if answer is None else self._scan(target, answer)
+        self._answers[target] = answer or len(self._values)
+        self._answers.move_to_end(target)
+        for i in answer:
+            self._by_index.setdefault(i, set()).add(target)
+        if len(self._answers) > self.max_targets:
+            self._drop(next(iter(self._answers)))
+        return list(answer)
+
+    def _scan(self, target, start):
+        # First live index from start on that completes a pair
+        for i in range(start, len(self._values)):
+            value = self._values[i]
+            found = self._positions.get(value)
+            if not found:
+                continue
+            k = bisect_left(found, i)
+            if k == len(found) or found[k] != i:
+                continue
+            other = self._positions.get(target - value)
+            if other:
+                k = bisect_left(other, i) - 1
+                if k >= 0:
+                    return [other[k], i]
+        return []
+
+    def _search(self, target):
+        best = None
+        for value, found in self._positions.items():
+            other = self._positions.get(target - value)
+            if other is None:
+                continue
+            if other is found:
+                if len(found) < 2:
+                    continue
+                need, i = value, found[1]
+            elif found[0] > other[0]:
+                need, i = target - value, found[0]
+            else:
+                need, i = value, other[0]
+            if best is None or i < best[1]:
+                best = (need, i)
+        if best is None:
+            return []
+        need, i = best
+        found = self._positions[need]
+        return [found[bisect_left(found, i) - 1], i]
+
+    def _drop(self, target):
+        answer = self._answers.pop(target)
+        if isinstance(answer, list):
+            for i in answer:
+                targets = self._by_index[i]
+                targets.discard(target)
+                if not targets:
+                    del self._by_index[i]
@@ -1,5 +1,10 @@
+import os
+import random
+import tempfile
 import unittest
-from sum_of_two import sum_of_two
+from array import array
+from sum_of_two import (sum_of_two, sum_of_two_batch, PairSumIndex,
+                        sum_of_two_stream, sum_of_two_file, sum_of_two_parallel)
 
 class TestSumOfTwo(unittest.TestCase):
 
@@ -24,4 +29,135 @@ class TestSumOfTwo(unittest.TestCase):
     def test_mixed_numbers(self):
         self.assertEqual(sum_of_two([-2, 1, 4, 6], 5), [1, 2])
 
+    def test_batch_matches_single(self):
+        nums = [3, 2, 4, 3, -1, 7, 2]
+        targets = [9, 6, 5, 100, 6, 1, 4]
+        expected = [sum_of_two(nums, target) for target in targets]
+        self.assertEqual(sum_of_two_batch(nums, targets), expected)
+
+    def test_batch_latest_duplicate(self):
+        self.assertEqual(sum_of_two_batch([1, 1, 5], [6]), [[1, 2]])
+
+    def test_batch_random(self):
+        rng = random.Random(1)
+        nums = [rng.randrange(-300, 300) for _ in range(2000)]
+        targets = list(range(-700, 700, 7)) + [0, 0, 599, -600]
+        self.assertEqual(sum_of_two_batch(nums, targets), [sum_of_two(nums, t) for t in targets])
+        # Sparse values, so pairs are completed across the prefix levels
+        nums = [rng.randrange(-10 ** 6, 10 ** 6) for _ in range(50000)]
+        targets = [rng.randrange(-10 ** 6, 10 ** 6) for _ in range(40)] + [2 * nums[-1], 3 * 10 ** 6]
+        self.assertEqual(sum_of_two_batch(nums, targets), [sum_of_two(nums, t) for t in targets])
+
+    def test_batch_fallback(self):
+        nums = [0.5, 2 ** 70, 1.5, -2 ** 70]
+        self.assertEqual(sum_of_two_batch(nums, [2.0, 0, 3]), [[0, 2], [1, 3], []])
+        self.assertEqual(sum_of_two_batch([2 ** 62, -2 ** 63, 5], [-2 ** 63 + 5]), [[1, 2]])
+
+    def test_batch_empty(self):
+        self.assertEqual(sum_of_two_batch([], [1, 2]), [[], []])
+        self.assertEqual(sum_of_two_batch([1, 2], []), [])
+
+    def test_index_matches_single(self):
+        index = PairSumIndex([2, 7, 11, 15])
+        self.assertEqual(index.find_pair(9), [0, 1])
+        self.assertEqual(index.find_pair(100), [])
+
+    def test_index_add_after_query(self):
+        index = PairSumIndex([3, 1])
+        self.assertEqual(index.find_pair(10), [])
+        index.extend([5, 7])
+        self.assertEqual(index.find_pair(10), [0, 3])
+        self.assertEqual(len(index), 4)
+
+    def test_index_remove(self):
+        index = PairSumIndex([3, 3, 4])
+        self.assertEqual(index.find_pair(6), [0, 1])
+        index.remove(3)
+        self.assertEqual(index.find_pair(6), [])
+        self.assertEqual(index.find_pair(7), [1, 2])
+        with self.assertRaises(ValueError):
+            index.remove(42)
+
+    def test_index_bounded_answers(self):
+        rng = random.Random(2)
+        index = PairSumIndex(max_targets=4)
+        nums = []
+        for _ in range(300):
+            value = rng.randrange(-40, 40)
+            index.add(value)
+            nums.append(value)
+            target = rng.randrange(-100, 100)
+            self.assertEqual(index.find_pair(target), sum_of_two(nums, target))
+            self.assertLessEqual(len(index._answers), 4)
+        live = dict(enumerate(nums))
+        for _ in range(100):
+            value = rng.choice(list(live.values()))
+            index.remove(value)
+            del live[min(i for i, v in live.items() if v == value)]
+            if rng.random() < 0.5:
+                live[len(nums)] = index_value = rng.randrange(-40, 40)
+                index.add(index_value)
+                nums.append(index_value)
+            target = rng.randrange(-100, 100)
+            indices = sorted(live)
+            expected = sum_of_two([live[i] for i in indices], target)
+            self.assertEqual(index.find_pair(target), [indices[k] for k in expected])
+        self.assertTrue(all(index._by_index.values()))
+        self.assertLessEqual(sum(map(len, index._by_index.values())), 8)
+
+    def test_stream_global_indices(self):
+        nums = [5, 1, 8, 2, 9, 4, 3]
+        for chunk_size in (1, 2, 3, 100):
+            self.assertEqual(sum_of_two_stream(iter(nums), 12, chunk_size), [2, 5])
+            self.assertEqual(sum_of_two_stream(nums, 11, chunk_size), [3, 4])
+            self.assertEqual(sum_of_two_stream(nums, 100, chunk_size), [])
+
+    def test_stream_stops_early(self):
+        def numbers():
+            yield from [2, 7]
+            raise AssertionError("read past the first pair")
+        self.assertEqual(sum_of_two_stream(numbers(), 9, chunk_size=2), [0, 1])
+
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "nums.bin")
+            with open(path, "wb") as f:
+                array("q", [-2, 1, 4, 6, 3]).tofile(f)
+            self.assertEqual(sum_of_two_file(path, 5, chunk_size=2), [1, 2])
+            self.assertEqual(sum_of_two_file(path, 50), [])
+            open(path, "wb").close()
+            self.assertEqual(sum_of_two_file(path, 5), [])
+            with open(path, "wb") as f:
+                f.write(b"\x00" * 12)
+            with self.assertRaisesRegex(ValueError, "nums.bin"):
+                sum_of_two_file(path, 5)
+
+    def test_parallel_matches_single(self):
+        nums = [4, 9, 1, 7, 4, 12, -3, 6, 5, 1, 8, 0]
+        for target in (2, 5, 8, 13, 21, 100):
+            for workers in (2, 3, 5):
+                self.assertEqual(sum_of_two_parallel(nums, target, workers, min_size=0),
+                                 sum_of_two(nums, target))
+
+    def test_parallel_random(self):
+        rng = random.Random(4)
+        nums = [rng.randrange(-500, 500) for _ in range(3000)]
+        for target in (0, 7, -999, 998, 5000):
+            self.assertEqual(sum_of_two_parallel(nums, target, 4, min_size=0), sum_of_two(nums, target))
+
+    def test_parallel_skewed(self):
+        rng = random.Random(5)
+        nums = [7] * 2000 + [rng.randrange(-50, 50) for _ in range(1000)] + [7] * 500
+        for target in (14, 0, 57, -100, 99):
+            for workers in (2, 7):
+                self.assertEqual(sum_of_two_parallel(nums, target, workers, min_size=0),
+                                 sum_of_two(nums, target))
+
+    def test_parallel_fallback(self):
+        self.assertEqual(sum_of_two_parallel([0.5, 2.0, 1.5], 2.0, 2, min_size=0), [0, 2])
+        self.assertEqual(sum_of_two_parallel([2 ** 62, -2 ** 63, 5], -2 ** 63 + 5, 2, min_size=0), [1, 2])
+
+    def test_parallel_small_input(self):
+        self.assertEqual(sum_of_two_parallel([2, 7, 11, 15], 9), [0, 1])
+
 unittest.main(argv=[''], verbosity=2, exit=False)
\ No newline at end of file
@@ -1,4 +1,8 @@
 import json
+import mmap
+import struct
+import sys
+from array import array
 
 def gen_bin_tree(height: int = 4,
                  root: int | float = 3, 
@@ -40,4 +44,445 @@ def gen_bin_tree(height: int = 4,
             "right": gen_bin_tree(height-1, right_branch(root), left_branch, right_branch)
         }
 
+def gen_bin_tree_iterative(height: int = 4,
+                           root: int | float = 3,
+                           left_branch = lambda x: x + 2,
+                           right_branch = lambda x: x * 3) -> dict | None:
+    """
+    Generate the same nested dictionary as gen_bin_tree without recursion.
+
+    The values are first computed top-down into one list per level, the
+    levels are kept on a stack and then popped to assemble the dictionaries
+    bottom-up, each node created once with its final children in the same
+    "value", "left", "right" key order. There is no recursion limit and no
+    per-node call frame, which makes it faster than gen_bin_tree for
+    heights 10-20 at the cost of keeping the values of all levels until
+    the tree is assembled.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+
+    Returns
+    -------
+    A nested dictionary representing the binary tree,
+    or Root value if the height is 0 and None if the height is less than 0.
+    """
+
+    if height < 0:
+        return None
+
+    levels = [[root]]
+    for _ in range(height):
+        level = []
+        append = level.append
+        for value in levels[-1]:
+            append(left_branch(value))
+            append(right_branch(value))
+        levels.append(level)
+
+    # Leaves stay plain values, as in gen_bin_tree
+    children = levels.pop()
+    while levels:
+        pairs = iter(children)
+        children = [{"value": value, "left": left, "right": right}
+                    for value, left, right in zip(levels.pop(), pairs, pairs)]
+    return children[0]
+
+def gen_bin_tree_shared(height: int = 4,
+                        root: int | float = 3,
+                        left_branch = lambda x: x + 2,
+                        right_branch = lambda x: x * 3) -> dict | None:
+    """
+    Generate a binary tree where identical subtrees are one shared object.
+
+    A subtree is fully determined by its root value and remaining height,
+    so subtrees are memoized on (value, height) and the result is a DAG
+    of the same nested dictionaries gen_bin_tree returns. For bounded
+    branch functions (e.g. x % k) the work and memory depend on the number
+    of distinct (value, height) states instead of 2^height nodes.
+    The states are collected level by level without recursion, so deep
+    trees work regardless of the recursion limit.
+    Shared nodes must not be modified in place.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+
+    Returns
+    -------
+    A nested dictionary with shared subtrees,
+    or Root value if the height is 0 and None if the height is less than 0.
+    """
+
+    if height < 0:
+        return None
+
+    # The distinct values of every level, top-down, with the positions of
+    # the children of each one in the next level; type is part of the key
+    # so that 1 and 1.0 stay different nodes
+    levels = []
+    values = [root]
+    for _ in range(height):
+        positions = {}
+        children = []
+        links = []
+        position = positions.setdefault
+        append = children.append
+        link = links.append
+        for value in values:
+            left = left_branch(value)
+            right = right_branch(value)
+            size = len(children)
+            found = position((type(left), left), size)
+            if found == size:
+                append(left)
+                size += 1
+            link(found)
+            found = position((type(right), right), size)
+            if found == size:
+                append(right)
+            link(found)
+        levels.append((values, links))
+        values = children
+
+    # Leaves stay plain values, as in gen_bin_tree
+    nodes = values
+    while levels:
+        values, links = levels.pop()
+        pairs = iter(links)
+        nodes = [{"value": value, "left": nodes[left], "right": nodes[right]}
+                 for value, left, right in zip(values, pairs, pairs)]
+    return nodes[0]
+
+class ArrayTree:
+    """
+    Complete binary tree stored as a flat heap-ordered sequence.
+
+    The root is at index 0 and the children of node i are at 2i+1 and 2i+2,
+    so a tree of the given height keeps 2^(height+1) - 1 values and no
+    per-node objects. With an 8-byte typecode ("q" or "d") a height-24 tree
+    takes 256 MiB instead of tens of millions of dicts, with a 4-byte one
+    ("i" or "f"), when the values fit, it takes 128 MiB.
+
+    Parameters
+    ----------
+    height : The height of the tree.
+    values : Heap-ordered node values (array, list, memoryview, ...).
+    """
+
+    def __init__(self, height: int, values):
+        self.height = height
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def value(self, i: int) -> int | float:
+        """Return the value stored in node i."""
+        return self.values[i]
+
+    def left(self, i: int) -> int | None:
+        """Return the index of the left child of node i or None for a leaf."""
+        child = 2 * i + 1
+        return child if child < len(self.values) else None
+
+    def right(self, i: int) -> int | None:
+        """Return the index of the right child of node i or None for a leaf."""
+        child = 2 * i + 2
+        return child if child < len(self.values) else None
+
+    def parent(self, i: int) -> int | None:
+        """Return the index of the parent of node i or None for the root."""
+        return (i - 1) // 2 if i > 0 else None
+
+    def to_dict(self) -> dict | int | float:
+        """
+        Convert the tree to the nested dictionary format of gen_bin_tree
+        (leaves are plain values as in gen_bin_tree).
+        The tree is assembled bottom-up level by level, without recursion.
+        """
+        values = self.values
+        if self.height == 0:
+            return values[0]
+
+        level_start = 2 ** self.height - 1
+        children = [values[i] for i in range(level_start, 2 * level_start + 1)]
+        for _ in range(self.height):
+            level_end = level_start
+            level_start = (level_start - 1) // 2
+            pairs = iter(children)
+            children = [{"value": values[i], "left": left, "right": right}
+                        for i, left, right in zip(range(level_start, level_end), pairs, pairs)]
+        return children[0]
+
+def gen_bin_tree_array(height: int = 4,
+                       root: int | float = 3,
+                       left_branch = lambda x: x + 2,
+                       right_branch = lambda x: x * 3,
+                       typecode: str | None = None) -> ArrayTree | None:
+    """
+    Generate a binary tree as a compact heap-ordered array.
+
+    The values are the same as in gen_bin_tree, but they are stored in
+    one array.array instead of one dictionary per node.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+    typecode : array typecode of the values. Defaults to "q" (int64)
+        for an int root and "d" (double) otherwise. Values that do not
+        fit the typecode raise OverflowError.
+
+    Returns
+    -------
+    An ArrayTree, or None if the height is less than 0.
+    """
+
+    if height < 0:
+        return None
+    if typecode is None:
+        typecode = "d" if isinstance(root, float) else "q"
+
+    values = array(typecode, [root]) * (2 ** (height + 1) - 1)
+    for i in range(2 ** height - 1):
+        value = values[i]
+        values[2 * i + 1] = left_branch(value)
+        values[2 * i + 2] = right_branch(value)
+    return ArrayTree(height, values)
+
+class LazyNode:
+    """
+    Binary tree node whose children are computed only when accessed.
+
+    Following one root-to-leaf path of a tree of height h evaluates only
+    2h branch functions instead of generating all 2^(h+1) - 1 nodes.
+    With memoize=True a child is computed once and kept, otherwise it is
+    recomputed (and nothing is retained) on every access.
+
+    Parameters
+    ----------
+    value : The value stored in the node.
+    height : The height of the subtree below this node (0 for a leaf).
+    left_branch : Lambda for computing left child's value.
+    right_branch : Lambda for computing right child's value.
+    memoize : Keep computed children. Defaults to True.
+    """
+
+    __slots__ = ("value", "height", "left_branch", "right_branch", "memoize", "_left", "_right")
+
+    def __init__(self, value: int | float, height: int, left_branch, right_branch, memoize: bool = True):
+        self.value = value
+        self.height = height
+        self.left_branch = left_branch
+        self.right_branch = right_branch
+        self.memoize = memoize
+        self._left = None
+        self._right = None
+
+    def _child(self, branch):
+        return LazyNode(branch(self.value), self.height - 1,
+                        self.left_branch, self.right_branch, self.memoize)
+
+    @property
+    def left(self) -> "LazyNode | None":
+        """The left child, or None for a leaf."""
+        if self.height <= 0:
+            return None
+        if self._left is not None:
+            return self._left
+        child = self._child(self.left_branch)
+        if self.memoize:
+            self._left = child
+        return child
+
+    @property
+    def right(self) -> "LazyNode | None":
+        """The right child, or None for a leaf."""
+        if self.height <= 0:
+            return None
+        if self._right is not None:
+            return self._right
+        child = self._child(self.right_branch)
+        if self.memoize:
+            self._right = child
+        return child
+
+    def to_dict(self) -> dict | int | float:
+        """Generate the whole subtree in the nested dictionary format of gen_bin_tree."""
+        return gen_bin_tree(self.height, self.value, self.left_branch, self.right_branch)
+
+def gen_lazy_bin_tree(height: int = 4,
+                      root: int | float = 3,
+                      left_branch = lambda x: x + 2,
+                      right_branch = lambda x: x * 3,
+                      memoize: bool = True) -> LazyNode | None:
+    """
+    Create the root of a lazily generated binary tree.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+    memoize : Keep children once they are computed. Defaults to True.
+
+    Returns
+    -------
+    A LazyNode, or None if the height is less than 0.
+    """
+
+    if height < 0:
+        return None
+    return LazyNode(root, height, left_branch, right_branch, memoize)
+
+# Binary tree file: magic, format version, array typecode, height,
+# then the heap-ordered values in little-endian byte order
+TREE_HEADER = struct.Struct("<4sBc2xq")
+TREE_MAGIC = b"BTRE"
+
+def save_bin_tree(path: str, tree: ArrayTree, typecode: str | None = None) -> None:
+    """
+    Write an ArrayTree to a compact binary file.
+
+    Parameters
+    ----------
+    path : The file to write.
+    tree : The tree, e.g. from gen_bin_tree_array.
+    typecode : array typecode of the stored values. Defaults to the
+        typecode of an array.array tree, otherwise "d" for float values
+        and "q" for integers.
+    """
+
+    values = tree.values
+    if typecode is None:
+        typecode = getattr(values, "typecode", None)
+    if typecode is None:
+        typecode = "d" if len(values) and isinstance(values[0], float) else "q"
+    if not isinstance(values, array) or values.typecode != typecode or sys.byteorder == "big":
+        values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    with open(path, "wb") as f:
+        f.write(TREE_HEADER.pack(TREE_MAGIC, 1, typecode.encode(), tree.height))
+        values.tofile(f)
+
+def load_bin_tree(path: str) -> ArrayTree:
+    """
+    Open a file written by save_bin_tree without reading or parsing it.
+
+    The file is memory-mapped and the values are a memoryview of the
+    mapping, so opening is instant and nodes are paged in on access.
+    The mapping stays open as long as the returned tree is referenced.
+    """
+
+    with open(path, "rb") as f:
+        header = f.read(TREE_HEADER.size)
+        if len(header) < TREE_HEADER.size or header[:4] != TREE_MAGIC:
+            raise ValueError(f"{path} is not a binary tree file")
+        _, version, typecode, height = TREE_HEADER.unpack(header)
+        if version != 1:
+            raise ValueError(f"unsupported binary tree file version {version}")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    typecode = typecode.decode()
+    values = memoryview(mapping)[TREE_HEADER.size:].cast(typecode)
+    if len(values) != 2 ** (height + 1) - 1:
+        raise ValueError(f"{path} is truncated")
+    if sys.byteorder == "big":
+        values = array(typecode, values.tobytes())
+        values.byteswap()
+    return ArrayTree(height, values)
+
+def iter_bin_tree_json(height: int = 4,
+                       root: int | float = 3,
+                       left_branch = lambda x: x + 2,
+                       right_branch = lambda x: x * 3,
+                       indent: int | str | None = 4):
+    """
+    Yield the JSON text of gen_bin_tree(...) piece by piece.
+
+    The tree is walked depth-first with an explicit stack and never built,
+    so memory stays proportional to the height. Joined together the pieces
+    are exactly json.dumps(gen_bin_tree(...), indent=indent)
+    (leaves are plain values, same separators and number formatting).
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+    indent : Indentation as in json.dumps, None for the compact one-line form.
+             Defaults to 4.
+    """
+
+    encode = json.JSONEncoder().encode
+    if height < 0:
+        yield "null"
+        return
+    if isinstance(indent, int):
+        indent = " " * indent
+
+    stack = [(root, height, 0)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+
+        value, height, depth = item
+        if height == 0:
+            yield encode(value)
+            continue
+
+        if indent is None:
+            opening, comma, close = "{", ", ", "}"
+        else:
+            pad = "\n" + indent * (depth + 1)
+            opening, comma, close = "{" + pad, "," + pad, "\n" + indent * depth + "}"
+        yield opening + '"value": ' + encode(value) + comma + '"left": '
+        stack.append(close)
+        stack.append((right_branch(value), height - 1, depth + 1))
+        stack.append(comma + '"right": ')
+        stack.append((left_branch(value), height - 1, depth + 1))
+
+def dump_bin_tree(fp,
+                  height: int = 4,
+                  root: int | float = 3,
+                  left_branch = lambda x: x + 2,
+                  right_branch = lambda x: x * 3,
+                  indent: int | str | None = 4,
+                  buffer_size: int = 1 << 16) -> None:
+    """
+    Write the tree as JSON to a text file object without building it.
+
+    The output is identical to json.dumps(gen_bin_tree(...), indent=indent),
+    pieces from iter_bin_tree_json are joined and written in blocks of
+    about buffer_size characters. For a socket pass sock.makefile("w").
+    """
+
+    buffer = []
+    size = 0
+    for piece in iter_bin_tree_json(height, root, left_branch, right_branch, indent):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= buffer_size:
+            fp.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    if buffer:
+        fp.write("".join(buffer))
+
 print(json.dumps(gen_bin_tree(), indent=4))
\ No newline at end of file
@@ -1,5 +1,12 @@
+import io
+import json
+import os
+import sys
+import tempfile
 import unittest
-from bin_tree import gen_bin_tree
+from bin_tree import (gen_bin_tree, gen_bin_tree_array, gen_lazy_bin_tree, dump_bin_tree,
+                      save_bin_tree, load_bin_tree,
+                      gen_bin_tree_shared, gen_bin_tree_iterative)
 
 class TestGenBinTree(unittest.TestCase):
 
@@ -111,4 +118,149 @@ class TestGenBinTree(unittest.TestCase):
         self.assertEqual(t1, t2)
         self.assertIsNot(t1, t2)
 
+    def test_array_to_dict(self):
+        """Check that the array tree converts to the same nested dictionary."""
+        for height in range(6):
+            self.assertEqual(gen_bin_tree_array(height, 3).to_dict(), gen_bin_tree(height, 3))
+        self.assertEqual(gen_bin_tree_array(3, 1.5).to_dict(), gen_bin_tree(3, 1.5))
+
+    def test_array_accessors(self):
+        """Verify heap-ordered layout and child/parent indices."""
+        tree = gen_bin_tree_array(height=2, root=3)
+        self.assertEqual(list(tree.values), [3, 5, 9, 7, 15, 11, 27])
+        self.assertEqual(tree.value(tree.right(0)), 9)
+        self.assertEqual(tree.value(tree.left(tree.right(0))), 11)
+        self.assertIsNone(tree.left(3))
+        self.assertEqual(tree.parent(6), 2)
+        self.assertIsNone(tree.parent(0))
+
+    def test_array_negative_height(self):
+        """Check the case when height is less than 0."""
+        self.assertIsNone(gen_bin_tree_array(height=-1))
+
+    def test_lazy_path(self):
+        """Check values along one path of a very deep lazy tree."""
+        calls = []
+        def left(x):
+            calls.append(x)
+            return x + 2
+        node = gen_lazy_bin_tree(height=60, root=3, left_branch=left)
+        for _ in range(60):
+            node = node.left
+        self.assertEqual(node.value, 3 + 2 * 60)
+        self.assertIsNone(node.left)
+        self.assertIsNone(node.right)
+        self.assertEqual(len(calls), 60)
+
+    def test_lazy_memoize(self):
+        """Verify that memoized children are computed once and others every time."""
+        tree = gen_lazy_bin_tree(height=2)
+        self.assertIs(tree.right, tree.right)
+        tree = gen_lazy_bin_tree(height=2, memoize=False)
+        self.assertIsNot(tree.right, tree.right)
+        self.assertEqual(tree.right.left.value, 11)
+
+    def test_lazy_to_dict(self):
+        """Check that the lazy tree expands to the same nested dictionary."""
+        self.assertEqual(gen_lazy_bin_tree().to_dict(), gen_bin_tree())
+        self.assertEqual(gen_lazy_bin_tree(height=0, root=10).to_dict(), 10)
+        self.assertIsNone(gen_lazy_bin_tree(height=-1))
+
+    def test_dump_matches_json(self):
+        """Check that the streamed JSON is identical to json.dumps of the tree."""
+        for height in range(-1, 6):
+            for root in (3, 1.5):
+                out = io.StringIO()
+                dump_bin_tree(out, height, root, buffer_size=10)
+                self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height, root), indent=4))
+
+    def test_dump_indent(self):
+        """Verify that custom indentation follows json.dumps."""
+        out = io.StringIO()
+        dump_bin_tree(out, height=2, indent="\t")
+        self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height=2), indent="\t"))
+
+    def test_dump_compact(self):
+        """Check that indent=None gives the compact form of json.dumps."""
+        for height in range(0, 4):
+            out = io.StringIO()
+            dump_bin_tree(out, height, indent=None)
+            self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height)))
+        out = io.StringIO()
+        dump_bin_tree(out, height=2, indent=0)
+        self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height=2), indent=0))
+
+    def test_shared_matches(self):
+        """Check that the shared tree equals the one generated node by node."""
+        for height in range(-1, 6):
+            self.assertEqual(gen_bin_tree_shared(height, 3), gen_bin_tree(height, 3))
+        modular = lambda x: (x + 1) % 3
+        self.assertEqual(gen_bin_tree_shared(5, 1, modular, modular), gen_bin_tree(5, 1, modular, modular))
+
+    def test_shared_subtrees(self):
+        """Ensure that equal subtrees are one object, which keeps deep trees small."""
+        tree = gen_bin_tree_shared(height=200, root=1, left_branch=lambda x: x % 2, right_branch=lambda x: x % 2)
+        self.assertIs(tree["left"], tree["right"])
+        self.assertEqual(tree["left"]["value"], 1)
+        tree = gen_bin_tree_shared(height=3, root=1, left_branch=lambda x: x, right_branch=float)
+        self.assertIsNot(tree["left"], tree["right"])
+        self.assertIsInstance(tree["right"]["value"], float)
+
+    def test_shared_deep(self):
+        """Ensure that a modular tree far deeper than the recursion limit is built."""
+        modular = lambda x: (x * 3 + 1) % 7
+        height = sys.getrecursionlimit() + 200
+        node = gen_bin_tree_shared(height, 1, modular, lambda x: x % 7)
+        value, depth = 1, 0
+        while isinstance(node, dict):
+            self.assertEqual(node["value"], value)
+            node, value, depth = node["left"], modular(value), depth + 1
+        self.assertEqual((node, depth), (value, height))
+
+    def test_iterative_matches(self):
+        """Check that the iterative engine builds the same tree with the same key order."""
+        for height in range(-1, 7):
+            for root in (3, 1.5):
+                tree = gen_bin_tree_iterative(height, root)
+                self.assertEqual(tree, gen_bin_tree(height, root))
+                self.assertEqual(json.dumps(tree), json.dumps(gen_bin_tree(height, root)))
+
+    def test_iterative_no_recursion_limit(self):
+        """Ensure that the iterative engine does not depend on the recursion limit."""
+        depth = 0
+        frame = sys._getframe()
+        while frame:
+            depth += 1
+            frame = frame.f_back
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(depth + 12)
+        try:
+            with self.assertRaises(RecursionError):
+                gen_bin_tree(height=16)
+            tree = gen_bin_tree_iterative(height=16)
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertEqual(tree, gen_bin_tree(height=16))
+
+    def test_binary_roundtrip(self):
+        """Check that a saved tree loads back with the same values and structure."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.bin")
+            for height, root in ((4, 3), (3, 1.5), (0, 10)):
+                save_bin_tree(path, gen_bin_tree_array(height, root))
+                tree = load_bin_tree(path)
+                self.assertEqual(tree.height, height)
+                self.assertEqual(list(tree.values), list(gen_bin_tree_array(height, root).values))
+                self.assertEqual(tree.to_dict(), gen_bin_tree(height, root))
+                del tree
+
+    def test_binary_bad_file(self):
+        """Ensure that files of another format are rejected."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.json")
+            with open(path, "w") as f:
+                f.write("{}")
+            with self.assertRaises(ValueError):
+                load_bin_tree(path)
+
 unittest.main(argv=[''], verbosity=2, exit=False)
\ No newline at end of file
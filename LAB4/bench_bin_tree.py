@@ -0,0 +1,238 @@
+"""
+Benchmark of the tree generators of LAB3 (recursive) and LAB4 (iterative).
+
+Every case is run for each height: one run under tracemalloc for the peak
+memory and the number of memory blocks still alive when the call returns
+(live_blocks, the tree itself; tracemalloc does not count allocations
+that were freed again), then wall time over several samples. A sample
+repeats the call until it lasts at least min_time, the median and
+quartiles of the per-call times are recorded. Results are written as JSON
+and/or CSV and can be compared with an earlier JSON file to catch
+regressions, a cell is only reported when its median moved by more than
+the tolerance and the interquartile ranges do not overlap:
+
+    python bench_bin_tree.py --heights 1-20 --json base.json
+    python bench_bin_tree.py --heights 1-20 --compare base.json
+"""
+import argparse
+import contextlib
+import csv
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIELDS = ["case", "height", "nodes", "number", "time_min", "time_q1", "time_median", "time_q3",
+          "peak_bytes", "live_blocks"]
+
+def load_lab(lab: str):
+    """Import <lab>/bin_tree.py under a unique name, hiding its demo output."""
+    path = os.path.join(ROOT, lab, "bin_tree.py")
+    spec = importlib.util.spec_from_file_location(f"{lab.lower()}_bin_tree", path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so that pickle finds its functions, e.g. the process pool workers
+    sys.modules[spec.name] = module
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+def make_cases() -> dict:
+    """Return {case name: function of height} for all available generators."""
+    lab3 = load_lab("LAB3")
+    lab4 = load_lab("LAB4")
+
+    def lazy_path(height):
+        node = lab3.gen_lazy_bin_tree(height)
+        while node.height:
+            node = node.left
+        return node
+
+    cases = {
+        "lab3_recursive": lambda height: lab3.gen_bin_tree(height),
+        "lab3_iterative": lambda height: lab3.gen_bin_tree_iterative(height),
+        "lab3_shared": lambda height: lab3.gen_bin_tree_shared(height),
+        "lab3_array": lambda height: lab3.gen_bin_tree_array(height),
+        "lab3_lazy_path": lazy_path,
+        "lab4_bfs": lambda height: lab4.gen_bin_tree(height),
+        "lab4_array": lambda height: lab4.gen_bin_tree_array(height),
+        "lab4_leaves_sum": lambda height: sum(v for _, _, v in lab4.iter_bin_tree_leaves(height)),
+        "lab4_parallel": lambda height: lab4.gen_bin_tree_parallel(height),
+    }
+    if importlib.util.find_spec("numpy") is not None:
+        # Import NumPy now so that it is not measured as part of the first case
+        lab4.gen_bin_tree_vectorized(0)
+        cases["lab4_vectorized"] = lambda height: lab4.gen_bin_tree_vectorized(height)
+    return cases
+
+def trace(func, height: int) -> dict:
+    """Peak memory and live blocks of one func(height) call under tracemalloc, and its duration."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = func(height)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    live_blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return {"height": height, "nodes": 2 ** (height + 1) - 1, "traced_time": elapsed,
+            "peak_bytes": peak, "live_blocks": live_blocks}
+
+def sample(func, height: int, number: int) -> float:
+    """Time per call of number func(height) calls, with the garbage collector off."""
+    was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func(height)
+        return (time.perf_counter() - start) / number
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def calibrate(func, height: int, min_time: float = 0.01) -> int:
+    """Smallest power of two number of calls lasting at least min_time."""
+    number = 1
+    while sample(func, height, number) * number < min_time:
+        number *= 2
+    return number
+
+def summarize(times: list) -> dict:
+    if len(times) > 1:
+        q1, median, q3 = statistics.quantiles(times, n=4, method="inclusive")
+    else:
+        q1 = median = q3 = times[0]
+    return {"time_min": min(times), "time_q1": q1, "time_median": median, "time_q3": q3}
+
+def run(cases: dict, heights, repeat: int = 9, time_limit: float = 30.0, min_time: float = 0.01) -> list:
+    """
+    Measure every case at every height.
+
+    Time roughly doubles with each level, so once a case needs more than
+    time_limit seconds for one call its larger heights are skipped.
+    The time samples are taken in rounds over all cells, so that the
+    samples of a cell are spread over the whole run and their quartiles
+    include the slow drift of the machine, not only a few quiet milliseconds.
+    """
+    cells = []
+    for name, func in cases.items():
+        for height in heights:
+            record = {"case": name, **trace(func, height)}
+            record["number"] = calibrate(func, height, min_time)
+            cells.append((func, record, []))
+            if record.pop("traced_time") > time_limit:
+                break
+
+    for _ in range(repeat):
+        for func, record, times in cells:
+            times.append(sample(func, record["height"], record["number"]))
+
+    results = []
+    for _, record, times in cells:
+        record.update(summarize(times))
+        results.append(record)
+        print(f"{record['case']:18} h={record['height']:<3} {record['time_median'] * 1000:10.3f} ms "
+              f"{record['peak_bytes'] / 2 ** 20:10.2f} MiB {record['live_blocks']:>10} live blocks",
+              file=sys.stderr)
+    return results
+
+def write_json(path: str, results: list) -> None:
+    meta = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=4)
+
+def write_csv(path: str, results: list) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+def compare(baseline: list, results: list, tolerance: float = 0.25) -> list:
+    """
+    Return descriptions of the (case, height) cells that got slower or
+    use more memory than the baseline by more than tolerance (0.25 = 25 %).
+
+    A time change only counts when the interquartile ranges of the old and
+    new samples do not overlap, otherwise it is taken as noise.
+    """
+    previous = {(r["case"], r["height"]): r for r in baseline}
+    regressions = []
+    for record in results:
+        old = previous.get((record["case"], record["height"]))
+        if old is None:
+            continue
+        old_median = old.get("time_median", old["time_min"])
+        if (old_median and record["time_median"] > old_median * (1 + tolerance)
+                and record.get("time_q1", record["time_median"]) > old.get("time_q3", old_median)):
+            regressions.append(f"{record['case']} h={record['height']}: time_median "
+                               f"{old_median:.6g} -> {record['time_median']:.6g} "
+                               f"(+{(record['time_median'] / old_median - 1) * 100:.0f}%)")
+        if old["peak_bytes"] and record["peak_bytes"] > old["peak_bytes"] * (1 + tolerance):
+            regressions.append(f"{record['case']} h={record['height']}: peak_bytes "
+                               f"{old['peak_bytes']} -> {record['peak_bytes']} "
+                               f"(+{(record['peak_bytes'] / old['peak_bytes'] - 1) * 100:.0f}%)")
+    return regressions
+
+def parse_heights(text: str) -> list:
+    """Parse "1-24" or "4,8,16" into a list of heights."""
+    heights = []
+    for part in text.split(","):
+        low, _, high = part.partition("-")
+        heights.extend(range(int(low), int(high or low) + 1))
+    return heights
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the LAB3/LAB4 tree generators.")
+    parser.add_argument("--heights", type=parse_heights, default=parse_heights("1-24"))
+    parser.add_argument("--cases", help="comma separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=9, help="time samples per cell")
+    parser.add_argument("--min-time", type=float, default=0.01, help="shortest time sample (s)")
+    parser.add_argument("--time-limit", type=float, default=30.0,
+                        help="skip larger heights of a case after a call slower than this (s)")
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--csv", help="write results to this CSV file")
+    parser.add_argument("--compare", help="baseline JSON file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    cases = make_cases()
+    if args.cases:
+        names = args.cases.split(",")
+        unknown = set(names) - cases.keys()
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+        cases = {name: cases[name] for name in names}
+
+    results = run(cases, args.heights, args.repeat, args.time_limit, args.min_time)
+    if args.json:
+        write_json(args.json, results)
+    if args.csv:
+        write_csv(args.csv, results)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f)["results"], results, args.tolerance)
+        for line in regressions:
+            print("REGRESSION", line)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
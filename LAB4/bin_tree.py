@@ -1,5 +1,12 @@
 import json
+import mmap
+import multiprocessing
+import pickle
+import struct
+import sys
+from array import array
 from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 def gen_bin_tree(height: int = 4, 
                  root: int | float = 3, 
@@ -69,4 +76,569 @@ def gen_bin_tree(height: int = 4,
 
     return root_node
 
+class ArrayTree:
+    """
+    Complete binary tree stored as a flat heap-ordered sequence.
+
+    The root is at index 0 and the children of node i are at 2i+1 and 2i+2,
+    so a tree of the given height keeps 2^(height+1) - 1 values and no
+    per-node objects. With an 8-byte typecode ("q" or "d") a height-24 tree
+    takes 256 MiB instead of tens of millions of dicts, with a 4-byte one
+    ("i" or "f"), when the values fit, it takes 128 MiB.
+
+    Parameters
+    ----------
+    height : The height of the tree.
+    values : Heap-ordered node values (array, list, memoryview, ...).
+    """
+
+    def __init__(self, height: int, values):
+        self.height = height
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def value(self, i: int) -> int | float:
+        """Return the value stored in node i."""
+        return self.values[i]
+
+    def left(self, i: int) -> int | None:
+        """Return the index of the left child of node i or None for a leaf."""
+        child = 2 * i + 1
+        return child if child < len(self.values) else None
+
+    def right(self, i: int) -> int | None:
+        """Return the index of the right child of node i or None for a leaf."""
+        child = 2 * i + 2
+        return child if child < len(self.values) else None
+
+    def parent(self, i: int) -> int | None:
+        """Return the index of the parent of node i or None for the root."""
+        return (i - 1) // 2 if i > 0 else None
+
+    def to_dict(self) -> dict | int | float:
+        """
+        Convert the tree to the nested dictionary format of gen_bin_tree
+        (leaves are {"value": ..., "left": None, "right": None} as in gen_bin_tree).
+        The tree is assembled bottom-up level by level, without recursion.
+        """
+        values = self.values
+        if hasattr(values, "tolist"):
+            # Plain Python numbers, also for NumPy-backed trees
+            values = values.tolist()
+        if self.height == 0:
+            return values[0]
+
+        level_start = 2 ** self.height - 1
+        children = [{"value": values[i], "left": None, "right": None} for i in range(level_start, 2 * level_start + 1)]
+        for _ in range(self.height):
+            level_end = level_start
+            level_start = (level_start - 1) // 2
+            pairs = iter(children)
+            children = [{"value": values[i], "left": left, "right": right}
+                        for i, left, right in zip(range(level_start, level_end), pairs, pairs)]
+        return children[0]
+
+def gen_bin_tree_array(height: int = 4,
+                       root: int | float = 3,
+                       left_branch = lambda x: x + 2,
+                       right_branch = lambda x: x * 3,
+                       typecode: str | None = None) -> ArrayTree | None:
+    """
+    Generate a binary tree as a compact heap-ordered array.
+
+    The values are the same as in gen_bin_tree, but they are stored in
+    one array.array instead of one dictionary per node.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+    typecode : array typecode of the values. Defaults to "q" (int64)
+        for an int root and "d" (double) otherwise. Values that do not
+        fit the typecode raise OverflowError.
+
+    Returns
+    -------
+    An ArrayTree, or None if the height is less than 0.
+    """
+
+    if height < 0:
+        return None
+    if typecode is None:
+        typecode = "d" if isinstance(root, float) else "q"
+
+    values = array(typecode, [root]) * (2 ** (height + 1) - 1)
+    for i in range(2 ** height - 1):
+        value = values[i]
+        values[2 * i + 1] = left_branch(value)
+        values[2 * i + 2] = right_branch(value)
+    return ArrayTree(height, values)
+
+def _apply(branch, level):
+    # Integer NumPy arrays wrap around silently. A float64 probe is only
+    # trusted far from the limits of the dtype (float rounding cannot move
+    # a value across half the range), otherwise, and for integer-only
+    # branches like << or ^ that reject floats, the branch is evaluated
+    # exactly on Python ints and that result is used, converted back to the
+    # dtype when every value fits
+    import numpy as np
+
+    if level.dtype.kind not in "iu":
+        return np.asarray(branch(level))
+    info = np.iinfo(level.dtype)
+    try:
+        with np.errstate(all="ignore"):
+            probe = np.asarray(branch(level.astype(np.float64)))
+        safe = bool(np.all((probe >= info.min / 2) & (probe <= info.max / 2)))
+    except TypeError:
+        safe = False
+    if safe:
+        return np.asarray(branch(level))
+    result = np.asarray(branch(level.astype(object)))
+    if result.dtype == object and all(type(value) is int and info.min <= value <= info.max
+                                      for value in result.flat):
+        return result.astype(level.dtype)
+    return result
+
+def gen_bin_tree_vectorized(height: int = 4,
+                            root: int | float = 3,
+                            left_branch = lambda x: x + 2,
+                            right_branch = lambda x: x * 3,
+                            dtype = None) -> ArrayTree | None:
+    """
+    Generate a binary tree level by level with NumPy array operations.
+
+    The branch functions must accept NumPy arrays (the default lambdas do):
+    each level is computed from the previous one with one call of
+    left_branch and one call of right_branch, so the whole tree takes
+    "height" vectorized steps instead of 2^height Python calls.
+    Left and right children are interleaved, which makes the concatenated
+    levels exactly the heap order of ArrayTree.
+
+    While the values are integers, every level is checked for int64
+    overflow (x * 3 overflows around height 40) and switches to object
+    dtype, i.e. exact Python ints, from the first level that would wrap.
+    Integer-only branches such as x << 1 or x ^ 5 work too, their levels
+    are computed on Python ints and converted back when they fit.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Array function for computing left children. Defaults to x + 2.
+    right_branch : Array function for computing right children. Defaults to x * 3.
+    dtype : NumPy dtype of the root level. Defaults to the dtype NumPy
+        picks for root (int64 or float64).
+
+    Returns
+    -------
+    An ArrayTree backed by a NumPy array, or None if the height is less than 0.
+    """
+
+    import numpy as np
+
+    if height < 0:
+        return None
+
+    level = np.array([root], dtype=dtype)
+    levels = [level]
+    for _ in range(height):
+        left = _apply(left_branch, level)
+        right = _apply(right_branch, level)
+        level = np.empty(2 * len(level), dtype=np.result_type(left, right))
+        level[0::2] = left
+        level[1::2] = right
+        levels.append(level)
+    return ArrayTree(height, np.concatenate(levels))
+
+# Binary tree file: magic, format version, array typecode, height,
+# then the heap-ordered values in little-endian byte order
+TREE_HEADER = struct.Struct("<4sBc2xq")
+TREE_MAGIC = b"BTRE"
+
+def save_bin_tree(path: str, tree: ArrayTree, typecode: str | None = None) -> None:
+    """
+    Write an ArrayTree to a compact binary file.
+
+    Parameters
+    ----------
+    path : The file to write.
+    tree : The tree, e.g. from gen_bin_tree_array.
+    typecode : array typecode of the stored values. Defaults to the
+        typecode of an array.array tree, otherwise "d" for float values
+        and "q" for integers.
+    """
+
+    values = tree.values
+    if typecode is None:
+        typecode = getattr(values, "typecode", None)
+    if typecode is None:
+        typecode = "d" if len(values) and isinstance(values[0], float) else "q"
+    if not isinstance(values, array) or values.typecode != typecode or sys.byteorder == "big":
+        values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    with open(path, "wb") as f:
+        f.write(TREE_HEADER.pack(TREE_MAGIC, 1, typecode.encode(), tree.height))
+        values.tofile(f)
+
+def load_bin_tree(path: str) -> ArrayTree:
+    """
+    Open a file written by save_bin_tree without reading or parsing it.
+
+    The file is memory-mapped and the values are a memoryview of the
+    mapping, so opening is instant and nodes are paged in on access.
+    The mapping stays open as long as the returned tree is referenced.
+    """
+
+    with open(path, "rb") as f:
+        header = f.read(TREE_HEADER.size)
+        if len(header) < TREE_HEADER.size or header[:4] != TREE_MAGIC:
+            raise ValueError(f"{path} is not a binary tree file")
+        _, version, typecode, height = TREE_HEADER.unpack(header)
+        if version != 1:
+            raise ValueError(f"unsupported binary tree file version {version}")
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    typecode = typecode.decode()
+    values = memoryview(mapping)[TREE_HEADER.size:].cast(typecode)
+    if len(values) != 2 ** (height + 1) - 1:
+        raise ValueError(f"{path} is truncated")
+    if sys.byteorder == "big":
+        values = array(typecode, values.tobytes())
+        values.byteswap()
+    return ArrayTree(height, values)
+
+def value_at(path,
+             root: int | float = 3,
+             left_branch = lambda x: x + 2,
+             right_branch = lambda x: x * 3) -> int | float:
+    """
+    Compute the value of a single node from its path, in O(depth).
+
+    Parameters
+    ----------
+    path : Steps from the root, a false item (0) goes to the left child
+        and a true one (1) to the right child.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+
+    Returns
+    -------
+    The value of the node at the end of the path.
+    """
+
+    value = root
+    for step in path:
+        value = right_branch(value) if step else left_branch(value)
+    return value
+
+def value_at_index(level: int,
+                   index: int,
+                   root: int | float = 3,
+                   left_branch = lambda x: x + 2,
+                   right_branch = lambda x: x * 3) -> int | float:
+    """
+    Compute the value of the node number index (from the left) on a level.
+
+    The bits of index, most significant first, are the path from the root,
+    so this is the node (level, index) of iter_bin_tree_bfs and the node
+    2^level - 1 + index of ArrayTree.
+    """
+
+    if not 0 <= index < 2 ** level:
+        raise IndexError(f"level {level} has no node {index}")
+    path = ((index >> shift) & 1 for shift in range(level - 1, -1, -1))
+    return value_at(path, root, left_branch, right_branch)
+
+def values_at(level: int,
+              indices,
+              root: int | float = 3,
+              left_branch = lambda x: x + 2,
+              right_branch = lambda x: x * 3):
+    """
+    Vectorized value_at_index for many nodes of one level with NumPy.
+
+    All nodes take one step per level together: both branch functions are
+    applied to the whole array and np.where picks the child by the next
+    bit of each index. Integer values switch to object dtype before they
+    would overflow int64, as in gen_bin_tree_vectorized.
+
+    Returns
+    -------
+    A NumPy array with the values in the order of indices.
+    """
+
+    import numpy as np
+
+    indices = np.asarray(indices, dtype=np.int64 if level < 63 else object)
+    if np.any((indices < 0) | (indices >= 2 ** level)):
+        raise IndexError(f"level {level} has no such node")
+
+    values = np.full(len(indices), root)
+    for shift in range(level - 1, -1, -1):
+        go_right = ((indices >> shift) & 1).astype(bool)
+        values = np.where(go_right, _apply(right_branch, values), _apply(left_branch, values))
+    return values
+
+def _branch_chunk(task) -> list:
+    left_branch, right_branch, values = task
+    children = []
+    for value in values:
+        children.append(left_branch(value))
+        children.append(right_branch(value))
+    return children
+
+# Branch functions of the running gen_bin_tree_parallel, inherited by the
+# forked process workers so that they need not be picklable
+_branches = []
+
+def _branch_inherited(values) -> list:
+    return _branch_chunk((*_branches, values))
+
+def _process_pool(left_branch, right_branch, max_workers):
+    # Forked workers inherit the branch functions, without fork they are
+    # pickled and None is returned when they cannot be (e.g. lambdas)
+    if "fork" in multiprocessing.get_all_start_methods():
+        _branches[:] = [left_branch, right_branch]
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("fork"))
+        return pool, _branch_inherited
+    try:
+        pickle.dumps((left_branch, right_branch))
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return None, None
+    return ProcessPoolExecutor(max_workers=max_workers), _branch_chunk
+
+def gen_bin_tree_parallel(height: int = 4,
+                          root: int | float = 3,
+                          left_branch = lambda x: x + 2,
+                          right_branch = lambda x: x * 3,
+                          executor: str = "process",
+                          max_workers: int | None = None,
+                          chunk_size: int = 1024,
+                          min_level_size: int = 4096) -> dict | None:
+    """
+    Generate a binary tree evaluating the branch functions in a pool.
+
+    The tree is built level by level as in gen_bin_tree. A level with at
+    least min_level_size nodes is split into chunks of chunk_size values
+    which are evaluated in a concurrent.futures pool, smaller levels are
+    evaluated serially. This pays off only for expensive branch functions.
+    With executor="process" the workers are forked and inherit the branch
+    functions, so lambdas work too; where fork is not available they must
+    be picklable, otherwise the tree is built serially. "thread" accepts
+    any callable but only helps when the functions release the GIL.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Function for computing left child's value. Defaults to x + 2.
+    right_branch : Function for computing right child's value. Defaults to x * 3.
+    executor : "process" or "thread". Defaults to "process".
+    max_workers : Pool size. Defaults to the executor's default.
+    chunk_size : Number of nodes per task. Defaults to 1024.
+    min_level_size : Smallest level evaluated in the pool. Defaults to 4096.
+
+    Returns
+    -------
+    A nested dictionary representing the binary tree,
+    or Root value if the height is 0 and None if the height is less than 0.
+    """
+
+    if executor not in ("process", "thread"):
+        raise ValueError(f"executor must be 'process' or 'thread', not {executor!r}")
+    if height < 0:
+        return None
+
+    values = [root]
+    level = [root]
+    pool = worker = None
+    serial = False
+    try:
+        for _ in range(height):
+            if pool is None and not serial and len(level) >= min_level_size:
+                if executor == "process":
+                    pool, worker = _process_pool(left_branch, right_branch, max_workers)
+                    serial = pool is None
+                else:
+                    pool, worker = ThreadPoolExecutor(max_workers=max_workers), _branch_chunk
+            if pool is None or len(level) < min_level_size:
+                level = _branch_chunk((left_branch, right_branch, level))
+            else:
+                chunks = [level[start:start + chunk_size] for start in range(0, len(level), chunk_size)]
+                if worker is _branch_chunk:
+                    chunks = [(left_branch, right_branch, chunk) for chunk in chunks]
+                level = [child for chunk in pool.map(worker, chunks) for child in chunk]
+            values.extend(level)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        _branches.clear()
+
+    # Levels are stored left/right interleaved, i.e. in heap order
+    return ArrayTree(height, values).to_dict()
+
+def iter_bin_tree_bfs(height: int = 4,
+                      root: int | float = 3,
+                      left_branch = lambda x: x + 2,
+                      right_branch = lambda x: x * 3):
+    """
+    Yield (depth, position, value) of every node level by level.
+
+    position is the index of the node within its level, counted from
+    the left. Values are computed on the fly and the tree is never built,
+    only the current level is held in the queue.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+    """
+
+    if height < 0:
+        return
+
+    queue = deque([(0, 0, root)])
+    while queue:
+        depth, position, value = queue.popleft()
+        yield depth, position, value
+        if depth < height:
+            queue.append((depth + 1, 2 * position, left_branch(value)))
+            queue.append((depth + 1, 2 * position + 1, right_branch(value)))
+
+def iter_bin_tree_dfs(height: int = 4,
+                      root: int | float = 3,
+                      left_branch = lambda x: x + 2,
+                      right_branch = lambda x: x * 3,
+                      leaves_only: bool = False):
+    """
+    Yield (depth, position, value) of the nodes in DFS pre-order.
+
+    Uses an explicit stack holding at most height + 1 pending nodes,
+    so a consumer can stop early without the rest of the tree ever
+    being computed. With leaves_only=True only the leaves are yielded.
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+    leaves_only : Skip the inner nodes. Defaults to False.
+    """
+
+    if height < 0:
+        return
+
+    stack = [(0, 0, root)]
+    while stack:
+        depth, position, value = stack.pop()
+        if depth == height:
+            yield depth, position, value
+            continue
+        if not leaves_only:
+            yield depth, position, value
+        stack.append((depth + 1, 2 * position + 1, right_branch(value)))
+        stack.append((depth + 1, 2 * position, left_branch(value)))
+
+def iter_bin_tree_leaves(height: int = 4,
+                         root: int | float = 3,
+                         left_branch = lambda x: x + 2,
+                         right_branch = lambda x: x * 3):
+    """Yield (depth, position, value) of the leaves from left to right."""
+    return iter_bin_tree_dfs(height, root, left_branch, right_branch, leaves_only=True)
+
+def iter_bin_tree_json(height: int = 4,
+                       root: int | float = 3,
+                       left_branch = lambda x: x + 2,
+                       right_branch = lambda x: x * 3,
+                       indent: int | str | None = 4):
+    """
+    Yield the JSON text of gen_bin_tree(...) piece by piece.
+
+    The tree is walked depth-first with an explicit stack and never built,
+    so memory stays proportional to the height. Joined together the pieces
+    are exactly json.dumps(gen_bin_tree(...), indent=indent)
+    (leaves are nodes with null children, same separators and number formatting).
+
+    Parameters
+    ----------
+    height : The height of the tree. Defaults to 4.
+    root : The value stored in the root node. Defaults to 3.
+    left_branch : Lambda for computing left child's value. Defaults to x + 2.
+    right_branch : Lambda for computing right child's value. Defaults to x * 3.
+    indent : Indentation as in json.dumps, None for the compact one-line form.
+             Defaults to 4.
+    """
+
+    encode = json.JSONEncoder().encode
+    if height < 0:
+        yield "null"
+        return
+    if height == 0:
+        yield encode(root)
+        return
+    if isinstance(indent, int):
+        indent = " " * indent
+
+    stack = [(root, height, 0)]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+
+        value, height, depth = item
+        if indent is None:
+            opening, comma, close = "{", ", ", "}"
+        else:
+            pad = "\n" + indent * (depth + 1)
+            opening, comma, close = "{" + pad, "," + pad, "\n" + indent * depth + "}"
+        if height == 0:
+            yield (opening + '"value": ' + encode(value) + comma
+                   + '"left": null' + comma + '"right": null' + close)
+            continue
+
+        yield opening + '"value": ' + encode(value) + comma + '"left": '
+        stack.append(close)
+        stack.append((right_branch(value), height - 1, depth + 1))
+        stack.append(comma + '"right": ')
+        stack.append((left_branch(value), height - 1, depth + 1))
+
+def dump_bin_tree(fp,
+                  height: int = 4,
+                  root: int | float = 3,
+                  left_branch = lambda x: x + 2,
+                  right_branch = lambda x: x * 3,
+                  indent: int | str | None = 4,
+                  buffer_size: int = 1 << 16) -> None:
+    """
+    Write the tree as JSON to a text file object without building it.
+
+    The output is identical to json.dumps(gen_bin_tree(...), indent=indent),
+    pieces from iter_bin_tree_json are joined and written in blocks of
+    about buffer_size characters. For a socket pass sock.makefile("w").
+    """
+
+    buffer = []
+    size = 0
+    for piece in iter_bin_tree_json(height, root, left_branch, right_branch, indent):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= buffer_size:
+            fp.write("".join(buffer))
+            buffer.clear()
+            size = 0
+    if buffer:
+        fp.write("".join(buffer))
+
 print(json.dumps(gen_bin_tree(), indent=4))
\ No newline at end of file
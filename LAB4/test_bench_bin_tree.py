@@ -0,0 +1,52 @@
+import contextlib
+import io
+import unittest
+from bench_bin_tree import FIELDS, compare, make_cases, parse_heights, run
+
+def record(case, height, median, q1=None, q3=None, peak=1000):
+    return {"case": case, "height": height, "time_median": median, "time_min": median,
+            "time_q1": median if q1 is None else q1, "time_q3": median if q3 is None else q3,
+            "peak_bytes": peak}
+
+class TestBenchBinTree(unittest.TestCase):
+
+    def test_compare_noise(self):
+        """Check that a slower median within overlapping quartiles is not a regression."""
+        baseline = [record("a", 4, 1.0, 0.8, 1.6)]
+        self.assertEqual(compare(baseline, [record("a", 4, 1.5, 1.2, 1.9)]), [])
+
+    def test_compare_regression(self):
+        """Verify that separated quartiles and a larger peak are reported."""
+        baseline = [record("a", 4, 1.0, 0.9, 1.1), record("b", 4, 1.0)]
+        results = [record("a", 4, 2.0, 1.8, 2.2), record("b", 4, 1.0, peak=2000), record("c", 4, 9.0)]
+        regressions = compare(baseline, results)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("a h=4: time_median"))
+        self.assertTrue(regressions[1].startswith("b h=4: peak_bytes"))
+
+    def test_compare_old_baseline(self):
+        """Ensure that a baseline without quartiles is compared by its minimum."""
+        baseline = [{"case": "a", "height": 2, "time_min": 1.0, "peak_bytes": 10}]
+        self.assertEqual(len(compare(baseline, [record("a", 2, 2.0, peak=10)])), 1)
+
+    def test_run(self):
+        """Check the fields of the measured cells and the skipping of slow heights."""
+        with contextlib.redirect_stderr(io.StringIO()):
+            results = run({"list": lambda height: [0] * 2 ** height}, [3, 4], repeat=3, min_time=0)
+            self.assertEqual(len(run({"slow": lambda height: None}, [1, 2], time_limit=-1)), 1)
+        self.assertEqual([set(result) for result in results], [set(FIELDS)] * 2)
+        self.assertEqual([(r["height"], r["nodes"], r["number"]) for r in results], [(3, 15, 1), (4, 31, 1)])
+        self.assertLessEqual(results[0]["time_q1"], results[0]["time_median"])
+
+    def test_run_parallel(self):
+        """Ensure that the process pool case runs at heights where it uses workers."""
+        cases = make_cases()
+        with contextlib.redirect_stderr(io.StringIO()):
+            results = run({"lab4_parallel": cases["lab4_parallel"]}, [13], repeat=1, min_time=0)
+        self.assertEqual(results[0]["nodes"], 2 ** 14 - 1)
+
+    def test_parse_heights(self):
+        """Check the height list syntax."""
+        self.assertEqual(parse_heights("1-3,8"), [1, 2, 3, 8])
+
+unittest.main(argv=[''], verbosity=2, exit=False)
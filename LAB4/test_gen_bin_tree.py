@@ -1,5 +1,17 @@
+import importlib.util
+import io
+import json
+import operator
+import os
+import tempfile
 import unittest
-from bin_tree import gen_bin_tree
+from functools import partial
+from bin_tree import (gen_bin_tree, gen_bin_tree_array, gen_bin_tree_vectorized, dump_bin_tree,
+                      save_bin_tree, load_bin_tree,
+                      gen_bin_tree_parallel, iter_bin_tree_bfs, iter_bin_tree_dfs, iter_bin_tree_leaves,
+                      value_at, value_at_index, values_at)
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
 
 class TestGenBinTree(unittest.TestCase):
 
@@ -173,6 +185,163 @@ class TestGenBinTree(unittest.TestCase):
         t1 = gen_bin_tree(height=4, root=3)
         t2 = gen_bin_tree(height=4, root=3)
         self.assertEqual(t1, t2)
-        self.assertIsNot(t1, t2)  
+        self.assertIsNot(t1, t2)
+
+    def test_array_to_dict(self):
+        """Check that the array tree converts to the same nested dictionary."""
+        for height in range(6):
+            self.assertEqual(gen_bin_tree_array(height, 3).to_dict(), gen_bin_tree(height, 3))
+        self.assertEqual(gen_bin_tree_array(3, 1.5).to_dict(), gen_bin_tree(3, 1.5))
+
+    def test_array_accessors(self):
+        """Verify heap-ordered layout and child/parent indices."""
+        tree = gen_bin_tree_array(height=2, root=3)
+        self.assertEqual(list(tree.values), [3, 5, 9, 7, 15, 11, 27])
+        self.assertEqual(tree.value(tree.right(0)), 9)
+        self.assertEqual(tree.value(tree.left(tree.right(0))), 11)
+        self.assertIsNone(tree.left(3))
+        self.assertEqual(tree.parent(6), 2)
+        self.assertIsNone(tree.parent(0))
+
+    def test_array_negative_height(self):
+        """Check the case when height is less than 0."""
+        self.assertIsNone(gen_bin_tree_array(height=-1))
+
+    @unittest.skipUnless(HAS_NUMPY, "requires numpy")
+    def test_vectorized_matches(self):
+        """Check that the vectorized tree equals the one built node by node."""
+        for height in range(6):
+            self.assertEqual(gen_bin_tree_vectorized(height, 3).to_dict(), gen_bin_tree(height, 3))
+        self.assertEqual(gen_bin_tree_vectorized(3, 1.5).to_dict(), gen_bin_tree(3, 1.5))
+        self.assertIsNone(gen_bin_tree_vectorized(-1))
+
+    @unittest.skipUnless(HAS_NUMPY, "requires numpy")
+    def test_vectorized_overflow(self):
+        """Ensure values beyond int64 stay exact instead of wrapping around."""
+        grow = lambda x: x * 10 ** 6
+        tree = gen_bin_tree_vectorized(height=4, root=3, right_branch=grow)
+        self.assertEqual(tree.value(len(tree) - 1), 3 * 10 ** 24)
+        self.assertEqual(tree.to_dict(), gen_bin_tree(4, 3, right_branch=grow))
+
+    @unittest.skipUnless(HAS_NUMPY, "requires numpy")
+    def test_vectorized_bitwise(self):
+        """Check integer-only branches and exact overflow of shifted values."""
+        for height, right in ((3, lambda x: x << 1), (3, lambda x: x ^ 5), (3, lambda x: x << 62)):
+            tree = gen_bin_tree_vectorized(height, 3, lambda x: x + 1, right)
+            self.assertEqual(tree.to_dict(), gen_bin_tree(height, 3, lambda x: x + 1, right))
+        self.assertEqual(list(values_at(3, [1, 2], 3, lambda x: x + 1, lambda x: x ^ 5)), [0, 2])
+        self.assertEqual(list(values_at(2, [3], 3, lambda x: x, lambda x: x << 40)), [3 << 80])
+
+    def test_dump_matches_json(self):
+        """Check that the streamed JSON is identical to json.dumps of the tree."""
+        for height in range(-1, 6):
+            for root in (3, 1.5):
+                out = io.StringIO()
+                dump_bin_tree(out, height, root, buffer_size=10)
+                self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height, root), indent=4))
+
+    def test_dump_indent(self):
+        """Verify that custom indentation follows json.dumps."""
+        out = io.StringIO()
+        dump_bin_tree(out, height=2, indent="\t")
+        self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height=2), indent="\t"))
+
+    def test_dump_compact(self):
+        """Check that indent=None gives the compact form of json.dumps."""
+        for height in range(0, 4):
+            out = io.StringIO()
+            dump_bin_tree(out, height, indent=None)
+            self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height)))
+        out = io.StringIO()
+        dump_bin_tree(out, height=2, indent=0)
+        self.assertEqual(out.getvalue(), json.dumps(gen_bin_tree(height=2), indent=0))
+
+    def test_parallel_threads(self):
+        """Check that the thread pool builds the same tree, also below the cutoff."""
+        self.assertEqual(gen_bin_tree_parallel(executor="thread"), gen_bin_tree())
+        tree = gen_bin_tree_parallel(height=5, executor="thread", chunk_size=3, min_level_size=2)
+        self.assertEqual(tree, gen_bin_tree(height=5))
+        self.assertEqual(gen_bin_tree_parallel(height=0, root=10), 10)
+        self.assertIsNone(gen_bin_tree_parallel(height=-1))
+
+    def test_parallel_processes(self):
+        """Check the process pool with picklable branch functions."""
+        left, right = partial(operator.add, 2), partial(operator.mul, 3)
+        tree = gen_bin_tree_parallel(5, 3, left, right, max_workers=2, chunk_size=4, min_level_size=8)
+        self.assertEqual(tree, gen_bin_tree(height=5))
+
+    def test_parallel_default_lambdas(self):
+        """Ensure that the default lambda branches work with the process pool."""
+        self.assertEqual(gen_bin_tree_parallel(height=13), gen_bin_tree(height=13))
+        tree = gen_bin_tree_parallel(6, 1, lambda x: x - 1, lambda x: x * 2, max_workers=2,
+                                     chunk_size=5, min_level_size=4)
+        self.assertEqual(tree, gen_bin_tree(6, 1, lambda x: x - 1, lambda x: x * 2))
+
+    def test_parallel_executor(self):
+        """Ensure that an unknown executor name is rejected."""
+        with self.assertRaises(ValueError):
+            gen_bin_tree_parallel(executor="gpu")
+
+    def test_iter_bfs(self):
+        """Check level order, positions and values of the BFS generator."""
+        nodes = list(iter_bin_tree_bfs(height=2))
+        self.assertEqual(nodes, [(0, 0, 3), (1, 0, 5), (1, 1, 9),
+                                 (2, 0, 7), (2, 1, 15), (2, 2, 11), (2, 3, 27)])
+        self.assertEqual(list(iter_bin_tree_bfs(height=0, root=10)), [(0, 0, 10)])
+        self.assertEqual(list(iter_bin_tree_bfs(height=-1)), [])
+
+    def test_iter_dfs(self):
+        """Check pre-order of the DFS generator."""
+        nodes = list(iter_bin_tree_dfs(height=2))
+        self.assertEqual(nodes, [(0, 0, 3), (1, 0, 5), (2, 0, 7), (2, 1, 15),
+                                 (1, 1, 9), (2, 2, 11), (2, 3, 27)])
+
+    def test_iter_leaves(self):
+        """Verify that leaves match the default tree and deep trees can stop early."""
+        leaves = [value for _, _, value in iter_bin_tree_leaves()]
+        self.assertEqual(leaves, [11, 27, 23, 63, 19, 51, 47, 135, 15, 39, 35, 99, 31, 87, 83, 243])
+        first = next(iter_bin_tree_leaves(height=500))
+        self.assertEqual(first, (500, 0, 3 + 2 * 500))
+
+    def test_value_at(self):
+        """Check direct addressing by path and by (level, index) against the generated tree."""
+        tree = gen_bin_tree_array(height=4)
+        for level in range(5):
+            for index in range(2 ** level):
+                self.assertEqual(value_at_index(level, index), tree.value(2 ** level - 1 + index))
+        self.assertEqual(value_at([1, 0, 1]), 33)
+        self.assertEqual(value_at([]), 3)
+        self.assertEqual(value_at_index(50, 2 ** 50 - 1), 3 ** 51)
+        with self.assertRaises(IndexError):
+            value_at_index(2, 4)
+
+    @unittest.skipUnless(HAS_NUMPY, "requires numpy")
+    def test_values_at(self):
+        """Check bulk addressing, including values beyond int64."""
+        self.assertEqual(list(values_at(4, [0, 5, 15])), [11, 51, 243])
+        self.assertEqual(list(values_at(50, [0, 2 ** 50 - 1])), [103, 3 ** 51])
+        with self.assertRaises(IndexError):
+            values_at(2, [4])
+
+    def test_binary_roundtrip(self):
+        """Check that a saved tree loads back with the same values and structure."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.bin")
+            for height, root in ((4, 3), (3, 1.5), (0, 10)):
+                save_bin_tree(path, gen_bin_tree_array(height, root))
+                tree = load_bin_tree(path)
+                self.assertEqual(tree.height, height)
+                self.assertEqual(list(tree.values), list(gen_bin_tree_array(height, root).values))
+                self.assertEqual(tree.to_dict(), gen_bin_tree(height, root))
+                del tree
+
+    def test_binary_bad_file(self):
+        """Ensure that files of another format are rejected."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.json")
+            with open(path, "w") as f:
+                f.write("{}")
+            with self.assertRaises(ValueError):
+                load_bin_tree(path)
 
 unittest.main(argv=[''], verbosity=2, exit=False)
\ No newline at end of file
@@ -0,0 +1,310 @@
+"""
+Reusable micro-benchmark framework for the LAB5 factorial functions.
+
+Cases are registered with an input set and a cache mode:
+- "warm": the function is called once before timing, cached results are reused,
+- "cold": the cache is cleared before every timed call (untimed),
+- None: plain function without a cache.
+
+Every measurement runs warm-up samples first, calibrates the number of
+calls per sample so that a sample lasts at least min_time, disables the
+garbage collector while timing and reports median, quartiles, IQR and
+Tukey outliers over the samples. Results are stored as JSON and can be
+compared with a baseline. Independent (case, input) cells can be spread
+over a pool of worker processes, each pinned to its own CPU:
+
+    python bench.py run --sizes 10-290:10 --out new.json
+    python bench.py run --sizes 1000-100000:1000 --workers 0 --out big.json
+    python bench.py compare base.json new.json
+"""
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+
+MODES = ("warm", "cold", None)
+
+class Case:
+    def __init__(self, name, func, inputs, mode=None, clear=None):
+        if mode not in MODES:
+            raise ValueError(f"unknown cache mode {mode!r}, expected one of {MODES}")
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.mode = mode
+        self.clear = clear or cache_clearer(func)
+        if mode is not None and self.clear is None:
+            raise ValueError(f"{name}: mode {mode!r} needs a function with a cache to clear")
+
+# Registered benchmark cases: name -> Case
+CASES = {}
+
+def cache_clearer(func):
+    """Return the function that empties func's cache (cache_clear or clear), or None."""
+    return getattr(func, "cache_clear", None) or getattr(func, "clear", None)
+
+def register(name, func, inputs, mode=None, clear=None):
+    CASES[name] = Case(name, func, inputs, mode, clear)
+    return CASES[name]
+
+def case(name, inputs, mode=None):
+    """Decorator form of register."""
+    def decorator(func):
+        register(name, func, inputs, mode)
+        return func
+    return decorator
+
+def _sample(func, arg, number, clear):
+    # Total time of number calls, the cache clearing is not timed
+    total = 0.0
+    timer = time.perf_counter
+    for _ in range(number):
+        if clear is not None:
+            clear()
+        start = timer()
+        func(arg)
+        total += timer() - start
+    return total
+
+def calibrate(func, arg, clear=None, min_time=0.001):
+    """Smallest number of calls from 1, 2, 5, 10, 20, 50, ... lasting at least min_time."""
+    number = 1
+    while True:
+        for factor in (1, 2, 5):
+            if _sample(func, arg, number * factor, clear) >= min_time:
+                return number * factor
+        number *= 10
+
+def summarize(samples):
+    """Median, quartiles, IQR and Tukey (1.5 IQR) outliers of per-call times."""
+    ordered = sorted(samples)
+    if len(ordered) > 1:
+        q1, _, q3 = statistics.quantiles(ordered, n=4, method="inclusive")
+    else:
+        q1 = q3 = ordered[0]
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    return {
+        "median": statistics.median(ordered),
+        "q1": q1,
+        "q3": q3,
+        "iqr": iqr,
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "outliers": sum(1 for t in ordered if t < low or t > high),
+    }
+
+def measure(func, arg, mode=None, clear=None, repeat=15, warmup=2, min_time=0.001, max_time=2.0):
+    """
+    Time func(arg) and return the statistics of the per-call time in seconds.
+
+    At least 5 and at most repeat samples are taken, sampling stops
+    early once max_time seconds were spent on it.
+    """
+    if mode is not None and clear is None:
+        clear = cache_clearer(func)
+    cold = clear if mode == "cold" else None
+    if mode == "warm":
+        func(arg)
+
+    was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        number = calibrate(func, arg, cold, min_time)
+        for _ in range(warmup):
+            _sample(func, arg, number, cold)
+        samples = []
+        deadline = time.perf_counter() + max_time
+        while len(samples) < repeat and (len(samples) < 5 or time.perf_counter() < deadline):
+            samples.append(_sample(func, arg, number, cold) / number)
+    finally:
+        if was_enabled:
+            gc.enable()
+
+    return {"number": number, "samples": samples, **summarize(samples)}
+
+def run(cases=None, **options):
+    """Measure every input of the given cases (default: all registered ones)."""
+    results = []
+    for item in cases or CASES.values():
+        for arg in item.inputs:
+            stats = measure(item.func, arg, item.mode, item.clear, **options)
+            results.append({"case": item.name, "input": arg, "mode": item.mode, **stats})
+    return results
+
+# (case, input) cells of the running run_parallel, inherited by the forked workers
+_cells = []
+
+def available_cpus():
+    """CPUs this process may run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def _pin_worker(cpus, counter):
+    # Every worker takes the next CPU of the list
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    cpu = cpus[index % len(cpus)]
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+def _measure_cell(index, options):
+    item, arg = _cells[index]
+    stats = measure(item.func, arg, item.mode, item.clear, **options)
+    cpu = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+    return {"case": item.name, "input": arg, "mode": item.mode, **stats,
+            "cpu": cpu[0] if cpu and len(cpu) == 1 else None}
+
+def run_parallel(cases=None, workers=None, pin=True, **options):
+    """
+    run() with the (case, input) cells measured in a pool of worker processes.
+
+    workers defaults to the number of available CPUs, with pin=True every
+    worker is bound to one of them (os.sched_setaffinity, where supported)
+    so that it is not migrated between cores while timing. The merged
+    results are in the order run() returns them, each record also has the
+    CPU it was measured on. The workers are forked and inherit the cases,
+    so functions and cache clearers need not be picklable; without fork
+    (or with a single worker) the cells are measured serially by run().
+    Cells running side by side still share caches and memory bandwidth,
+    leave CPUs free or compare only results taken with the same workers.
+    """
+    global _cells
+    cases = list(cases or CASES.values())
+    cpus = available_cpus()
+    workers = workers or len(cpus)
+    if workers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return run(cases, **options)
+
+    _cells = [(item, arg) for item in cases for arg in item.inputs]
+    context = multiprocessing.get_context("fork")
+    initializer, initargs = None, ()
+    if pin:
+        initializer, initargs = _pin_worker, (cpus, context.Value("i", 0))
+    try:
+        with context.Pool(min(workers, len(_cells)) or 1, initializer, initargs) as pool:
+            return pool.starmap(_measure_cell, [(i, options) for i in range(len(_cells))], chunksize=1)
+    finally:
+        _cells = []
+
+def save(path, results):
+    meta = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=4)
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+def compare(baseline, results, threshold=0.05):
+    """
+    Compare medians cell by cell.
+
+    A cell is "slower"/"faster" only when the median changed by more than
+    threshold and the interquartile ranges do not overlap, otherwise the
+    difference is reported as noise ("same").
+    """
+    previous = {(r["case"], r["input"], r["mode"]): r for r in baseline}
+    rows = []
+    for new in results:
+        old = previous.get((new["case"], new["input"], new["mode"]))
+        if old is None:
+            continue
+        ratio = new["median"] / old["median"] if old["median"] else float("inf")
+        verdict = "same"
+        if ratio > 1 + threshold and new["q1"] > old["q3"]:
+            verdict = "slower"
+        elif ratio < 1 - threshold and new["q3"] < old["q1"]:
+            verdict = "faster"
+        rows.append({"case": new["case"], "input": new["input"], "mode": new["mode"],
+                     "baseline": old["median"], "median": new["median"],
+                     "ratio": ratio, "verdict": verdict})
+    return rows
+
+def print_results(results, file=sys.stdout):
+    print(f"{'Case':25} {'n':>8} {'mode':>5} | {'median (µs)':>12} {'IQR (µs)':>10} "
+          f"{'outliers':>8} {'loops':>7}", file=file)
+    print("-" * 84, file=file)
+    for r in results:
+        print(f"{r['case']:25} {r['input']:>8} {str(r['mode']):>5} | {r['median'] * 1e6:12.3f} "
+              f"{r['iqr'] * 1e6:10.3f} {r['outliers']:>8} {r['number']:>7}", file=file)
+
+def parse_sizes(text):
+    """Parse "10-290:10" (start-stop:step, inclusive) or "10,100,1000" into a list."""
+    sizes = []
+    for part in text.split(","):
+        bounds, _, step = part.partition(":")
+        low, _, high = bounds.partition("-")
+        sizes.extend(range(int(low), int(high or low) + 1, int(step or 1)))
+    return sizes
+
+def register_factorials(sizes, names=None):
+    """Register the factorial implementations of main.py, memoized ones in both cache modes."""
+    from main import FACTORIALS
+
+    for name in names or FACTORIALS:
+        func = FACTORIALS[name][1]
+        if cache_clearer(func) is None:
+            register(name, func, sizes)
+        else:
+            register(f"{name}[cold]", func, sizes, "cold")
+            register(f"{name}[warm]", func, sizes, "warm")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the LAB5 factorial functions.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("names", nargs="*", help="implementations from main.FACTORIALS (default: all)")
+    run_parser.add_argument("--sizes", type=parse_sizes, default=parse_sizes("10-290:10"))
+    run_parser.add_argument("--repeat", type=int, default=15)
+    run_parser.add_argument("--warmup", type=int, default=2)
+    run_parser.add_argument("--min-time", type=float, default=0.001)
+    run_parser.add_argument("--max-time", type=float, default=2.0)
+    run_parser.add_argument("--workers", type=int, default=1,
+                            help="measure cells in this many processes, 0 = one per available CPU")
+    run_parser.add_argument("--no-pin", action="store_true", help="do not pin the workers to CPUs")
+    run_parser.add_argument("--out", help="write results to this JSON file")
+
+    compare_parser = commands.add_parser("compare", help="compare results with a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--threshold", type=float, default=0.05)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        register_factorials(args.sizes, args.names)
+        results = run_parallel(workers=args.workers or None, pin=not args.no_pin,
+                               repeat=args.repeat, warmup=args.warmup,
+                               min_time=args.min_time, max_time=args.max_time)
+        print_results(results)
+        if args.out:
+            save(args.out, results)
+        return 0
+
+    rows = compare(load(args.baseline), load(args.results), args.threshold)
+    print(f"{'Case':25} {'n':>8} {'mode':>5} | {'base (µs)':>10} {'new (µs)':>10} {'ratio':>7}  verdict")
+    print("-" * 84)
+    for row in rows:
+        print(f"{row['case']:25} {row['input']:>8} {str(row['mode']):>5} | {row['baseline'] * 1e6:10.3f} "
+              f"{row['median'] * 1e6:10.3f} {row['ratio']:7.3f}  {row['verdict']}")
+    return 1 if any(row["verdict"] == "slower" for row in rows) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+import html
+import os
+
+# Plots and reports of benchmark series.
+# series is {label: [time in µs for every n in sizes]}, the tables label
+# their rows with sizes under the corner header ("n").
+# matplotlib is imported only when a plot is made: files are rendered with
+# the Agg canvas through matplotlib.figure.Figure, which works without a
+# display, only show_plot goes through pyplot and the interactive backend.
+
+def _draw(ax, sizes, series, title):
+    for label, times in series.items():
+        ax.plot(sizes, times, label=label)
+    ax.set_xlabel("n")
+    ax.set_ylabel("Time (µs)")
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True)
+
+def save_plot(path, sizes, series, title="Comparison of Factorial Calculation Methods"):
+    """Render the plot to a file, the format (png, svg, pdf, ...) follows the extension."""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(10, 6))
+    _draw(fig.add_subplot(), sizes, series, title)
+    fig.savefig(path, bbox_inches="tight")
+    return path
+
+def show_plot(sizes, series, title="Comparison of Factorial Calculation Methods"):
+    """Open the plot in an interactive window (blocks until it is closed)."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    _draw(ax, sizes, series, title)
+    plt.show()
+
+def markdown_table(sizes, series, corner="n"):
+    labels = list(series)
+    lines = [(f"| {corner} | " if corner else "| | ") + " | ".join(labels) + " |",
+             "|---:|" + "---:|" * len(labels)]
+    for i, n in enumerate(sizes):
+        lines.append(f"| {n} | " + " | ".join(f"{series[label][i]:.2f}" for label in labels) + " |")
+    return "\n".join(lines)
+
+def html_table(sizes, series, corner="n"):
+    labels = list(series)
+    rows = [f"<tr><th>{html.escape(corner)}</th>" + "".join(f"<th>{html.escape(label)}</th>" for label in labels) + "</tr>"]
+    for i, n in enumerate(sizes):
+        rows.append(f"<tr><td>{n}</td>"
+                    + "".join(f"<td>{series[label][i]:.2f}</td>" for label in labels) + "</tr>")
+    return "<table>\n" + "\n".join(rows) + "\n</table>"
+
+def write_report(directory, sizes, series, single_call=None, image_format="png", report_format="md",
+                 title="Comparison of Factorial Calculation Methods"):
+    """
+    Write the plot and a Markdown or HTML report with the timing tables
+    into directory and return the path of the report.
+
+    single_call is an optional {label: time in µs} of the clean single-call run.
+    """
+    os.makedirs(directory, exist_ok=True)
+    image = save_plot(os.path.join(directory, f"factorial.{image_format}"), sizes, series, title)
+    image_name = os.path.basename(image)
+
+    if report_format == "md":
+        parts = [f"# {title}", ""]
+        if single_call:
+            parts += ["## Clean benchmark: single call", "",
+                      markdown_table(["Time (µs)"], {label: [t] for label, t in single_call.items()}, ""), ""]
+        parts += ["## Time (µs) by n", "", markdown_table(sizes, series), "",
+                  f"![{title}]({image_name})", ""]
+    elif report_format == "html":
+        parts = ["<!DOCTYPE html>", "<html><head><meta charset=\"utf-8\">",
+                 f"<title>{html.escape(title)}</title></head><body>", f"<h1>{html.escape(title)}</h1>"]
+        if single_call:
+            parts += ["<h2>Clean benchmark: single call</h2>",
+                      html_table(["Time (µs)"], {label: [t] for label, t in single_call.items()}, "")]
+        parts += ["<h2>Time (µs) by n</h2>", html_table(sizes, series),
+                  f"<img src=\"{html.escape(image_name)}\" alt=\"{html.escape(title)}\">",
+                  "</body></html>", ""]
+    else:
+        raise ValueError(f"unknown report format {report_format!r}, expected 'md' or 'html'")
+
+    path = os.path.join(directory, f"report.{report_format}")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+    return path
@@ -0,0 +1,351 @@
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+import metrics
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_MISSING = object()
+
+# Values stored at once by the bottom-up fill of memoize
+FILL_BATCH = 256
+
+# Separates positional and keyword arguments in a cache key.
+# Pickled by reference, so persistent stores see the same bytes in every process.
+class _KwargsMark:
+    def __reduce__(self):
+        return "_KWARGS_MARK"
+
+_KWARGS_MARK = _KwargsMark()
+
+# Least recently used eviction
+class LRUCache:
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        if self.maxsize is None:
+            # Without a bound the order is never used
+            return self._data.get(key, default)
+        try:
+            value = self._data[key]
+        except KeyError:
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = value
+        if self.maxsize is not None:
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+# Least frequently used eviction, ties are broken by least recent use.
+# Keys are grouped in buckets by use count, so every operation is O(1).
+class LFUCache:
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._data = {}
+        self._counts = {}
+        self._buckets = {}
+        self._min_count = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _touch(self, key):
+        count = self._counts[key]
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+        self._counts[key] = count + 1
+        self._buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            return default
+        self._touch(key)
+        return self._data[key]
+
+    def set(self, key, value):
+        if key in self._data:
+            self._data[key] = value
+            self._touch(key)
+            return
+        if self.maxsize is not None and len(self._data) >= self.maxsize:
+            if self.maxsize <= 0:
+                return
+            bucket = self._buckets[self._min_count]
+            evicted, _ = bucket.popitem(last=False)
+            if not bucket:
+                del self._buckets[self._min_count]
+            del self._data[evicted]
+            del self._counts[evicted]
+        self._data[key] = value
+        self._counts[key] = 1
+        self._buckets.setdefault(1, OrderedDict())[key] = None
+        self._min_count = 1
+
+    def delete(self, key):
+        if key in self._data:
+            count = self._counts.pop(key)
+            bucket = self._buckets[count]
+            del bucket[key]
+            if not bucket:
+                del self._buckets[count]
+            del self._data[key]
+
+    def clear(self):
+        self._data.clear()
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+POLICIES = {"lru": LRUCache, "lfu": LFUCache}
+
+# Fixed pickle protocol, so that equal keys encode to the same bytes in every process
+_PROTOCOL = 4
+
+def _encode_value(value):
+    # Exact ints (factorials) are stored as their signed little-endian bytes,
+    # everything else is pickled
+    if type(value) is int:
+        return b"i" + value.to_bytes(value.bit_length() // 8 + 1, "little", signed=True)
+    return b"p" + pickle.dumps(value, _PROTOCOL)
+
+def _decode_value(data):
+    if data[:1] == b"i":
+        return int.from_bytes(data[1:], "little", signed=True)
+    return pickle.loads(data[1:])
+
+# Persistent store in an SQLite file, entries survive restarts and are
+# shared by all processes on the host that open the same file.
+# Several functions can use one file, each under its own namespace.
+# The database runs in WAL mode, so readers do not block the writer, and
+# reads go through a memory map of up to mmap_size bytes of the file.
+# Eviction is not supported, the file grows until clear() is called.
+class SQLiteCache:
+    maxsize = None
+
+    def __init__(self, path, namespace="", mmap_size=1 << 28, timeout=30.0):
+        self.path = path
+        self.namespace = namespace
+        self.mmap_size = mmap_size
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        # A connection must not be used across fork, the child opens its own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            conn.execute("CREATE TABLE IF NOT EXISTS memo (namespace TEXT NOT NULL, key BLOB NOT NULL, "
+                         "value BLOB NOT NULL, PRIMARY KEY (namespace, key)) WITHOUT ROWID")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM memo WHERE namespace = ?",
+                                          (self.namespace,)).fetchone()[0]
+
+    def get(self, key, default=None):
+        row = self._connection().execute("SELECT value FROM memo WHERE namespace = ? AND key = ?",
+                                         (self.namespace, pickle.dumps(key, _PROTOCOL))).fetchone()
+        return default if row is None else _decode_value(row[0])
+
+    def set(self, key, value):
+        self._connection().execute("INSERT OR REPLACE INTO memo VALUES (?, ?, ?)",
+                                   (self.namespace, pickle.dumps(key, _PROTOCOL), _encode_value(value)))
+
+    def delete(self, key):
+        self._connection().execute("DELETE FROM memo WHERE namespace = ? AND key = ?",
+                                   (self.namespace, pickle.dumps(key, _PROTOCOL)))
+
+    def clear(self):
+        self._connection().execute("DELETE FROM memo WHERE namespace = ?", (self.namespace,))
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+def _make_key(args, kwargs):
+    return args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+
+# Per thread: [(key, value) of k - 1] while a bottom-up fill of memoize
+# computes func(k), [None] otherwise
+class _FillState(threading.local):
+    def __init__(self):
+        self.last = [None]
+
+# Memoization decorator
+# Can be used as @memoize or @memoize(maxsize=..., policy="lru" | "lfu", ttl=seconds).
+# backend replaces the in-memory LRU/LFU store with any object that has
+# get/set/delete/clear/__len__, e.g. SQLiteCache("memo.db", "fact") to keep
+# the results on disk. maxsize and policy only apply to the in-memory stores.
+# With a backend ttl deadlines are wall-clock times, so they stay valid
+# across processes.
+# While metrics are enabled every call is reported under the function's
+# module.qualname (see metrics.py), values computed by the bottom-up fill
+# count as misses.
+# The cache is guarded by a lock, the function itself runs outside of it,
+# so recursive memoized functions and concurrent callers do not deadlock.
+#
+# bottom_up=True is for functions of one int n >= 0 that recurse into n - 1
+# (like a recursive factorial): on a cold call the store is probed downward
+# for the highest cached k < n and the values above it are computed in a
+# loop, func(k) only recurses into k - 1, which the wrapper answers from
+# the fill, so any n works regardless of the recursion limit, also after
+# evictions or expiry. These inner calls are not counted as hits.
+def memoize(func=None, *, maxsize=None, policy="lru", ttl=None, bottom_up=False, backend=None):
+    if policy not in POLICIES:
+        raise ValueError(f"unknown cache policy {policy!r}, expected one of {sorted(POLICIES)}")
+    if bottom_up and maxsize is not None and maxsize < 2:
+        raise ValueError("bottom_up needs maxsize of at least 2 to keep k - 1 cached")
+    if backend is not None and maxsize is not None:
+        raise ValueError("maxsize applies to the in-memory cache, not to a backend")
+    clock = time.monotonic if backend is None else time.time
+
+    def decorator(func):
+        store = POLICIES[policy](maxsize) if backend is None else backend
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0}
+        if type(store) is LRUCache and maxsize is None:
+            # Unbounded LRU keeps no order, use its dict directly
+            get, put = store._data.get, store._data.__setitem__
+        else:
+            get, put = store.get, store.set
+        name = metrics.qualified_name(func)
+
+        def cached(key):
+            # Live value stored under key or _MISSING, called with the lock held
+            entry = get(key, _MISSING)
+            if entry is _MISSING or ttl is None:
+                return entry
+            value, deadline = entry
+            if clock() < deadline:
+                return value
+            store.delete(key)
+            return _MISSING
+
+        fill_state = _FillState()
+
+        def store_batch(batch):
+            # Bounded stores would evict all but the last maxsize values anyway
+            with lock:
+                for key, value in batch[-maxsize:] if maxsize else batch:
+                    put(key, value if ttl is None else (value, clock() + ttl))
+                stats["misses"] += len(batch)
+            if metrics.enabled:
+                for _, value in batch:
+                    metrics.record_fill(name, value)
+
+        def fill(n):
+            # Compute every k < n above the highest cached one in order, then
+            # func(n). func(k) gets k - 1 from fill_state through the wrapper,
+            # without the lock and without counting a hit, and the values are
+            # stored in batches under one lock.
+            with lock:
+                # An empty store, e.g. after cache_clear, needs no probe
+                k = n - 1 if len(store) else -1
+                if ttl is None:
+                    while k >= 0 and get((k,), _MISSING) is _MISSING:
+                        k -= 1
+                    value = get((k,), _MISSING)
+                else:
+                    while k >= 0 and cached((k,)) is _MISSING:
+                        k -= 1
+                    value = cached((k,))
+            last = fill_state.last
+            outer = last[0]
+            last[0] = None if value is _MISSING else ((k,), value)
+            try:
+                for first in range(k + 1, n, FILL_BATCH):
+                    batch = []
+                    for k in range(first, min(first + FILL_BATCH, n)):
+                        value = func(k)
+                        last[0] = entry = ((k,), value)
+                        batch.append(entry)
+                    store_batch(batch)
+                return func(n)
+            finally:
+                last[0] = outer
+
+        def wrapper(*args, **kwargs):
+            if bottom_up:
+                last = fill_state.last[0]
+                if last is not None and last[0] == args and not kwargs:
+                    return last[1]
+            key = _make_key(args, kwargs) if kwargs else args
+            with lock:
+                entry = get(key, _MISSING)
+                if entry is not _MISSING:
+                    if ttl is None:
+                        stats["hits"] += 1
+                        if metrics.enabled:
+                            metrics.record_hit(name)
+                        return entry
+                    value, deadline = entry
+                    if clock() < deadline:
+                        stats["hits"] += 1
+                        if metrics.enabled:
+                            metrics.record_hit(name)
+                        return value
+                    store.delete(key)
+                stats["misses"] += 1
+
+            state = metrics.enter(name) if metrics.enabled else None
+            try:
+                if bottom_up and not kwargs and len(args) == 1 and isinstance(args[0], int):
+                    value = fill(args[0])
+                else:
+                    value = func(*args, **kwargs)
+            except BaseException:
+                if state is not None:
+                    metrics.leave(name, state)
+                raise
+            with lock:
+                put(key, value if ttl is None else (value, clock() + ttl))
+            if state is not None:
+                metrics.leave(name, state, False, value)
+            return value
+
+        def cache_info():
+            with lock:
+                return CacheInfo(stats["hits"], stats["misses"], getattr(store, "maxsize", None), len(store))
+
+        def cache_clear():
+            with lock:
+                store.clear()
+                stats["hits"] = stats["misses"] = 0
+
+        wrapper.cache_info = cache_info
+        metrics.register_cache(name, cache_info)
+        wrapper.cache_clear = cache_clear
+        return update_wrapper(wrapper, func)
+
+    if func is not None:
+        return decorator(func)
+    return decorator
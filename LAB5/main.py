@@ -1,21 +1,23 @@
+import argparse
+import threading
 import timeit
-import matplotlib.pyplot as plt
-
-# Memoization decorator
-def memoize(func):
-    cache = {}
-    def wrapper(n):
-        if n not in cache:
-            cache[n] = func(n)
-        return cache[n]   
-    return wrapper
+from bisect import bisect_right
+from math import isqrt, lgamma
+from bench import Case, cache_clearer, measure, run_parallel
+from bench_report import show_plot, write_report
+from cache import memoize
+import metrics
+from metrics import track
 
 # Non-memoized factorial functions
+# track registers them for metrics.py, they stay plain functions
+@track
 def fact_recursive(n):
     if n == 0 or n == 1:
         return 1
     return n * fact_recursive(n - 1)
 
+@track
 def fact_iterative(n):
     res = 1
     while n >= 1:
@@ -23,8 +25,117 @@ def fact_iterative(n):
         n = n - 1
     return res
 
+# Fast factorial functions for big n.
+# Multiplying 1*2*...*n one by one makes the running product huge early,
+# splitting the factors into halves multiplies numbers of similar size,
+# which is where Python's Karatsuba multiplication pays off.
+def _product(factors, lo, hi):
+    # Product of factors[lo:hi]
+    if hi - lo <= 8:
+        res = 1
+        for i in range(lo, hi):
+            res *= factors[i]
+        return res
+    mid = (lo + hi) // 2
+    return _product(factors, lo, mid) * _product(factors, mid, hi)
+
+def _range_product(lo, hi):
+    # Product of the integers lo..hi
+    if hi - lo < 8:
+        res = 1
+        for k in range(lo, hi + 1):
+            res *= k
+        return res
+    mid = (lo + hi) // 2
+    return _range_product(lo, mid) * _range_product(mid + 1, hi)
+
+@track
+def fact_binary_split(n):
+    if n < 0:
+        raise ValueError("factorial is not defined for negative values")
+    return _range_product(2, n) if n > 1 else 1
+
+def _odd_primes(n):
+    # Sieve of Eratosthenes, odd primes up to n
+    sieve = bytearray([1]) * (n + 1)
+    sieve[:2] = b"\x00\x00"
+    for p in range(2, isqrt(n) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, n + 1, p)))
+    return [p for p in range(3, n + 1, 2) if sieve[p]]
+
+def _odd_swing(n, primes):
+    # Odd part of the swinging factorial n! / (n // 2)!^2 from its prime factorization
+    root = isqrt(n)
+    factors = []
+    for p in primes[:bisect_right(primes, n)]:
+        if p <= root:
+            q, power = n, 1
+            while q := q // p:
+                if q & 1:
+                    power *= p
+            if power > 1:
+                factors.append(power)
+        elif (n // p) & 1:
+            factors.append(p)
+    return _product(factors, 0, len(factors))
+
+def _odd_factorial(n, primes):
+    if n < 2:
+        return 1
+    return _odd_factorial(n // 2, primes) ** 2 * _odd_swing(n, primes)
+
+# Prime swing algorithm (P. Luschny): n! = (n // 2)!^2 * swing(n),
+# the powers of two are collected separately and applied with one shift
+@track
+def fact_prime_swing(n):
+    if n < 0:
+        raise ValueError("factorial is not defined for negative values")
+    if n < 2:
+        return 1
+    return _odd_factorial(n, _odd_primes(n)) << (n - n.bit_count())
+
+# Factorials of many n at once with NumPy.
+# The distinct n are sorted, one cumulative product runs up to the largest
+# of them (each gap multiplied as a product tree) and the results are
+# scattered back to the positions of the queries.
+# With log=True float ln(n!) values are returned instead: a cumulative
+# sum of logs when the queries are dense, lgamma(n + 1) when they are sparse.
+@track
+def fact_batch(ns, log=False):
+    import numpy as np
+
+    ns = np.asarray(ns)
+    if ns.size == 0:
+        ns = ns.astype(np.int64)
+    if ns.dtype.kind not in "iu":
+        raise TypeError("factorials are defined for integer arrays only")
+    if ns.size and ns.min() < 0:
+        raise ValueError("factorial is not defined for negative values")
+
+    unique, inverse = np.unique(ns.ravel(), return_inverse=True)
+    if log:
+        top = int(unique[-1]) if unique.size else 0
+        if top <= 4 * unique.size + 1024:
+            logs = np.zeros(top + 1)
+            np.cumsum(np.log(np.arange(1, top + 1)), out=logs[1:])
+            table = logs[unique]
+        else:
+            table = np.array([lgamma(n + 1) for n in unique.tolist()])
+    else:
+        table = np.empty(unique.size, dtype=object)
+        res, prev = 1, 1
+        for i, n in enumerate(unique.tolist()):
+            if n > prev:
+                res *= _range_product(prev + 1, n)
+                prev = n
+            table[i] = res
+    return table[inverse].reshape(ns.shape)
+
 # Memoized factorial functions
-@memoize
+# The cache of fact_recursive_memo is filled bottom-up, so a cold call
+# with n above the recursion limit works too
+@memoize(bottom_up=True)
 def fact_recursive_memo(n):
     if n == 0 or n == 1:
         return 1
@@ -38,67 +149,151 @@ def fact_iterative_memo(n):
         n = n - 1
     return res
 
-# Benchmark function 
-# Runs several repeats and takes the minimum time
-def benchmark(func, data, number=1, repeat=5):
+# Memoized factorial that reuses the nearest smaller cached factorial.
+# The largest computed factorial and every step-th one (checkpoints) are kept,
+# n! is extended from the largest one or from the checkpoint below n,
+# so a sweep over n costs O(max n) multiplications instead of O(sum of n).
+# Checkpoints of huge factorials are large: raise step for n in the 10^5 range.
+# Extending and reading the checkpoints is guarded by a lock, the
+# multiplications from a checkpoint up to a smaller n run outside of it.
+class PrefixFactorial:
+    def __init__(self, step=32):
+        self.step = step
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self._lock:
+            self.checkpoints = [1]  # checkpoints[i] == (i * step)!
+            self.top_n = 0
+            self.top = 1
+
+    @track(name="fact_prefix_memo")
+    def __call__(self, n):
+        if n < 0:
+            raise ValueError("factorial is not defined for negative values")
+        with self._lock:
+            if n >= self.top_n:
+                res = self.top
+                for k in range(self.top_n + 1, n + 1):
+                    res *= k
+                    if k % self.step == 0:
+                        self.checkpoints.append(res)
+                self.top_n, self.top = n, res
+                return res
+            i = n // self.step
+            res = self.checkpoints[i]
+        for k in range(i * self.step + 1, n + 1):
+            res *= k
+        return res
+
+fact_prefix_memo = PrefixFactorial()
+
+# Benchmark function
+# Median time of one call for every input (see bench.py), averaged over inputs.
+# Memoized functions are measured on a cold cache, otherwise all repeats
+# after the first one would only time a cache lookup.
+def benchmark(func, data, repeat=5):
+    mode = "cold" if cache_clearer(func) else None
     total = 0
     for n in data:
-        times = timeit.repeat(lambda: func(n), number=number, repeat=repeat)
-        total += min(times)
+        total += measure(func, n, mode, repeat=repeat)["median"]
     return total / len(data)
 
-def main():
+# Implementations compared by the benchmark: name -> (label, function).
+# Names given on the command line select a subset, e.g.
+# python main.py iterative binary_split prime_swing
+FACTORIALS = {
+    "recursive": ("Recursive", fact_recursive),
+    "iterative": ("Iterative", fact_iterative),
+    "recursive_memo": ("Recursive (memo)", fact_recursive_memo),
+    "iterative_memo": ("Iterative (memo)", fact_iterative_memo),
+    "prefix_memo": ("Prefix (memo)", fact_prefix_memo),
+    "binary_split": ("Binary splitting", fact_binary_split),
+    "prime_swing": ("Prime swing", fact_prime_swing),
+}
+
+def clear_caches():
+    fact_recursive_memo.cache_clear()
+    fact_iterative_memo.cache_clear()
+    fact_prefix_memo.clear()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the factorial implementations.")
+    parser.add_argument("names", nargs="*", help=f"implementations to compare: {', '.join(FACTORIALS)} (default: all)")
+    parser.add_argument("--out", help="directory to write the plot and the report to")
+    parser.add_argument("--format", choices=("png", "svg"), default="png", help="image format of the plot")
+    parser.add_argument("--report", choices=("md", "html"), default="md", help="format of the report")
+    parser.add_argument("--no-show", action="store_true", help="do not open the interactive plot window")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="benchmark the (function, n) cells in this many pinned processes, 0 = one per CPU")
+    parser.add_argument("--metrics", help="record call statistics of the run and write them to this file "
+                                          "in Prometheus text format (slows down the timings)")
+    args = parser.parse_args(argv)
+    if args.metrics and args.workers != 1:
+        # The statistics of the forked workers would be lost with them
+        parser.error("--metrics records the calls of this process only, it needs --workers 1")
+
+    names = args.names or list(FACTORIALS)
+    unknown = [name for name in names if name not in FACTORIALS]
+    if unknown:
+        raise SystemExit(f"Unknown implementations: {', '.join(unknown)}. "
+                         f"Available: {', '.join(FACTORIALS)}")
+
+    if args.metrics:
+        metrics.enable()
+
     n = 100
 
     # Clean one-run benchmark before any plotting or repeated benchmarking
     # Clear memo caches explicitly
-    fact_recursive_memo.__closure__[0].cell_contents.clear()
-    fact_iterative_memo.__closure__[0].cell_contents.clear()
+    clear_caches()
 
-    t1 = timeit.timeit(lambda: fact_recursive(n), number=1)
-    t2 = timeit.timeit(lambda: fact_iterative(n), number=1)
-    t3 = timeit.timeit(lambda: fact_recursive_memo(n), number=1)
-    t4 = timeit.timeit(lambda: fact_iterative_memo(n), number=1)
+    times = {}
+    for name in names:
+        func = FACTORIALS[name][1]
+        times[name] = timeit.timeit(lambda: func(n), number=1)
 
     # Print results of clean benchmark in Microseconds
     print("\n=== Clean benchmark: single call ===")
     print(f"{'Function':25} | Time (µs)")
     print("-" * 45)
-    print(f"{'Recursive':25} | {t1 * 1_000_000:.2f}")
-    print(f"{'Iterative':25} | {t2 * 1_000_000:.2f}")
-    print(f"{'Recursive (memo)':25} | {t3 * 1_000_000:.2f}")
-    print(f"{'Iterative (memo)':25} | {t4 * 1_000_000:.2f}")
+    for name in names:
+        print(f"{FACTORIALS[name][0]:25} | {times[name] * 1_000_000:.2f}")
 
     # Clear caches again before the multi-run benchmark
-    fact_recursive_memo.__closure__[0].cell_contents.clear()
-    fact_iterative_memo.__closure__[0].cell_contents.clear()
+    clear_caches()
 
     # Benchmark for plotting
-    res_recursive = []
-    res_iterative = []
-    res_recursive_memo = []
-    res_iterative_memo = []   
-
     test_data = list(range(10, 300, 10))
+    results = {name: [] for name in names}
+
+    if args.workers == 1:
+        for n in test_data:
+            for name in names:
+                results[name].append(benchmark(FACTORIALS[name][1], [n]) * 1_000_000)
+    else:
+        # Same measurements as benchmark(), one cell per function and n
+        cases = []
+        for name in names:
+            func = FACTORIALS[name][1]
+            cases.append(Case(name, func, test_data, "cold" if cache_clearer(func) else None))
+        for record in run_parallel(cases, args.workers or None, repeat=5):
+            results[record["case"]].append(record["median"] * 1_000_000)
+
+    if args.metrics:
+        metrics.disable()
+        with open(args.metrics, "w", encoding="utf-8") as f:
+            f.write(metrics.prometheus())
 
-    for n in test_data:
-        res_recursive.append(benchmark(fact_recursive, [n]) * 1_000_000)
-        res_iterative.append(benchmark(fact_iterative, [n]) * 1_000_000)
-        res_recursive_memo.append(benchmark(fact_recursive_memo, [n]) * 1_000_000)
-        res_iterative_memo.append(benchmark(fact_iterative_memo, [n]) * 1_000_000)
-
-    # Plotting results
-    plt.plot(test_data, res_recursive, label="Recursive")
-    plt.plot(test_data, res_iterative, label="Iterative")
-    plt.plot(test_data, res_recursive_memo, label="Recursive (memoized)")
-    plt.plot(test_data, res_iterative_memo, label="Iterative (memoized)")
-
-    plt.xlabel("n")
-    plt.ylabel("Time (µs)")
-    plt.title("Comparison of Factorial Calculation Methods")
-    plt.legend()
-    plt.grid(True)
-    plt.show()
+    # Plotting results, matplotlib is only imported here
+    series = {FACTORIALS[name][0]: results[name] for name in names}
+    if args.out:
+        single_call = {FACTORIALS[name][0]: times[name] * 1_000_000 for name in names}
+        path = write_report(args.out, test_data, series, single_call, args.format, args.report)
+        print(f"\nReport written to {path}")
+    if not args.no_show:
+        show_plot(test_data, series)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Runtime instrumentation of the LAB5 factorial and memoized functions.
+
+Per function it records the number of calls, cache hits and misses, the
+cumulative time and the size of the values stored in the cache:
+
+    import metrics
+    metrics.enable()
+    fact_recursive_memo(500)
+    metrics.disable()
+    metrics.snapshot()    # {"main.fact_recursive_memo": {"calls": ..., ...}}
+    metrics.prometheus()  # text exposition format
+
+Memoized functions report themselves: while disabled every memoize call
+only checks the enabled flag. Plain functions are registered with track(),
+which returns them unchanged; their calls are counted through a profile
+hook that is installed only while instrumentation is enabled, so there is
+no overhead at all when it is off (and a noticeable one for every Python
+call when it is on). Time is counted for the outermost call of recursive
+functions only, so it is never counted twice.
+
+Functions are reported as module.qualname, so functions of the same name
+defined in different modules are told apart; track(name=...) replaces the
+qualname, the module is kept. A module run as a script is named after its
+file, so `python main.py` and `import main` both report main.<function>.
+
+enable() replaces the profile hook of the calling thread and of threads
+started later. Threads that are already running are only traced when
+threading.setprofile_all_threads is available (Python 3.12+), otherwise
+their calls of tracked functions are missed. disable() puts back the hooks
+that were installed before enable().
+"""
+import os
+import sys
+import threading
+import time
+import weakref
+
+FIELDS = ("calls", "hits", "misses", "seconds", "stored_bytes")
+
+# Checked by memoize on every call
+enabled = False
+
+_lock = threading.Lock()
+_local = threading.local()
+_stats = {}
+# name -> cache_info of memoized functions, for the number of entries
+_caches = weakref.WeakValueDictionary()
+# code object -> name of the functions registered with track
+_tracked = {}
+# (sys, threading) profile hooks replaced by enable, restored by disable
+_previous = None
+
+def _empty():
+    stats = dict.fromkeys(FIELDS, 0)
+    stats["seconds"] = 0.0
+    return stats
+
+def _record(name):
+    stats = _stats.get(name)
+    if stats is None:
+        stats = _stats[name] = _empty()
+    return stats
+
+def _depths():
+    # Per thread: name -> [nesting depth, start of the outermost call]
+    depths = getattr(_local, "depths", None)
+    if depths is None:
+        depths = _local.depths = {}
+    return depths
+
+def enter(name):
+    """Start a timed call of name, returns the token for leave."""
+    state = _depths().setdefault(name, [0, 0.0])
+    state[0] += 1
+    if state[0] == 1:
+        state[1] = time.perf_counter()
+    return state
+
+def leave(name, state, hit=None, value=None):
+    """Finish the call started by enter; hit is True/False for cache lookups, None otherwise."""
+    state[0] -= 1
+    elapsed = time.perf_counter() - state[1] if state[0] == 0 else 0.0
+    with _lock:
+        stats = _record(name)
+        stats["calls"] += 1
+        stats["seconds"] += elapsed
+        if hit:
+            stats["hits"] += 1
+        elif hit is not None:
+            stats["misses"] += 1
+            stats["stored_bytes"] += sys.getsizeof(value)
+
+def record_hit(name):
+    """Count a call answered from the cache."""
+    with _lock:
+        stats = _record(name)
+        stats["calls"] += 1
+        stats["hits"] += 1
+
+def record_fill(name, value):
+    """Count a value computed and stored ahead of a call (memoize's bottom-up fill)."""
+    with _lock:
+        stats = _record(name)
+        stats["misses"] += 1
+        stats["stored_bytes"] += sys.getsizeof(value)
+
+def qualified_name(func, name=None):
+    """Return the name func is reported under, module.qualname (or module.name)."""
+    module = func.__module__
+    if module == "__main__":
+        main = sys.modules.get("__main__")
+        spec = getattr(main, "__spec__", None)
+        if spec is not None:
+            module = spec.name
+        elif getattr(main, "__file__", None):
+            module = os.path.splitext(os.path.basename(main.__file__))[0]
+    return f"{module}.{name or func.__qualname__}"
+
+def register_cache(name, cache_info):
+    """Report the number of entries of a memoized function (called by memoize)."""
+    _caches[name] = cache_info
+
+def track(func=None, *, name=None):
+    """Register a plain function for call counting, it is returned unchanged."""
+    def decorator(func):
+        _tracked[func.__code__] = qualified_name(func, name)
+        return func
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+def _profile(frame, event, arg):
+    if event == "call":
+        name = _tracked.get(frame.f_code)
+        if name is not None:
+            enter(name)
+    elif event == "return":
+        name = _tracked.get(frame.f_code)
+        if name is not None:
+            state = _depths().get(name)
+            # The call may have started before the hook was installed
+            if state and state[0]:
+                leave(name, state)
+
+def enable():
+    global enabled, _previous
+    enabled = True
+    # Calls left open by an earlier disable would hide the time of later ones
+    _local.depths = {}
+    if _tracked and _previous is None:
+        _previous = (sys.getprofile(), threading.getprofile())
+        setprofile_all_threads = getattr(threading, "setprofile_all_threads", None)
+        if setprofile_all_threads is not None:
+            setprofile_all_threads(_profile)
+        else:
+            threading.setprofile(_profile)
+            sys.setprofile(_profile)
+
+def disable():
+    global enabled, _previous
+    enabled = False
+    if _previous is None:
+        return
+    previous, previous_threading = _previous
+    _previous = None
+    setprofile_all_threads = getattr(threading, "setprofile_all_threads", None)
+    if setprofile_all_threads is not None and sys.getprofile() is _profile:
+        # Running threads get the caller's previous hook, their own was replaced
+        setprofile_all_threads(previous)
+        threading.setprofile(previous_threading)
+        return
+    # A hook installed by someone else since enable is left in place
+    if threading.getprofile() is _profile:
+        threading.setprofile(previous_threading)
+    if sys.getprofile() is _profile:
+        sys.setprofile(previous)
+
+def is_enabled():
+    return enabled
+
+def reset():
+    """Drop the recorded statistics (caches are not cleared)."""
+    with _lock:
+        _stats.clear()
+
+def snapshot():
+    """Return {name: {calls, hits, misses, seconds, stored_bytes[, entries]}}."""
+    with _lock:
+        result = {name: dict(stats) for name, stats in _stats.items()}
+    for name, cache_info in list(_caches.items()):
+        result.setdefault(name, _empty())["entries"] = cache_info().currsize
+    return result
+
+_PROMETHEUS = (
+    ("calls", "calls_total", "counter", "Calls of the function."),
+    ("hits", "cache_hits_total", "counter", "Calls answered from the cache."),
+    ("misses", "cache_misses_total", "counter", "Calls that computed and stored a value."),
+    ("seconds", "call_seconds_total", "counter", "Time spent in outermost calls."),
+    ("stored_bytes", "cache_stored_bytes_total", "counter", "Size of the values stored in the cache."),
+    ("entries", "cache_entries", "gauge", "Entries currently in the cache."),
+)
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def prometheus(prefix="lab5"):
+    """Return the snapshot in the Prometheus text exposition format."""
+    data = snapshot()
+    lines = []
+    for field, metric, kind, description in _PROMETHEUS:
+        samples = [(name, stats[field]) for name, stats in sorted(data.items()) if field in stats]
+        if not samples:
+            continue
+        lines.append(f"# HELP {prefix}_{metric} {description}")
+        lines.append(f"# TYPE {prefix}_{metric} {kind}")
+        for name, value in samples:
+            lines.append(f"{prefix}_{metric}{{function=\"{_label(name)}\"}} {value}")
+    return "\n".join(lines) + "\n"
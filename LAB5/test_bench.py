@@ -0,0 +1,102 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from bench import Case, compare, measure, parse_sizes, run, run_parallel, summarize
+from bench_report import html_table, markdown_table, write_report
+from cache import memoize
+
+HAS_MATPLOTLIB = importlib.util.find_spec("matplotlib") is not None
+
+class TestBench(unittest.TestCase):
+
+    def test_summarize(self):
+        """Check median, quartiles and Tukey outliers."""
+        stats = summarize([1, 2, 3, 4, 5, 6, 7, 100])
+        self.assertEqual(stats["median"], 4.5)
+        self.assertEqual((stats["q1"], stats["q3"]), (2.75, 6.25))
+        self.assertEqual(stats["outliers"], 1)
+        self.assertEqual(summarize([2.0])["iqr"], 0)
+
+    def test_cache_modes(self):
+        """Verify that cold mode computes on every call and warm mode only once."""
+        calls = []
+
+        @memoize
+        def square(n):
+            calls.append(n)
+            return n * n
+
+        stats = measure(square, 3, mode="cold", repeat=5, warmup=0, min_time=0)
+        self.assertEqual(len(calls), stats["number"] * 6)
+        calls.clear()
+        stats = measure(square, 4, mode="warm", repeat=5, warmup=0, min_time=0)
+        self.assertEqual(calls, [4])
+        self.assertEqual(len(stats["samples"]), 5)
+
+    def test_case_needs_cache(self):
+        """Ensure that cache modes are rejected for functions without a cache."""
+        with self.assertRaises(ValueError):
+            Case("abs", abs, [1], mode="cold")
+        with self.assertRaises(ValueError):
+            Case("abs", abs, [1], mode="hot")
+
+    def test_compare(self):
+        """Check that only changes beyond threshold and IQR are reported."""
+        def result(median, q1, q3):
+            return {"case": "f", "input": 10, "mode": None, "median": median, "q1": q1, "q3": q3}
+
+        baseline = [result(1.0, 0.9, 1.1)]
+        self.assertEqual(compare(baseline, [result(1.5, 1.4, 1.6)])[0]["verdict"], "slower")
+        self.assertEqual(compare(baseline, [result(0.5, 0.4, 0.6)])[0]["verdict"], "faster")
+        self.assertEqual(compare(baseline, [result(1.2, 1.0, 1.3)])[0]["verdict"], "same")
+        self.assertEqual(compare(baseline, [dict(result(1.0, 1, 1), input=20)]), [])
+
+    def test_parse_sizes(self):
+        """Check the size list syntax."""
+        self.assertEqual(parse_sizes("10-50:20,100"), [10, 30, 50, 100])
+
+    def test_run_parallel(self):
+        """Check that cells measured by workers merge in the order of a serial run."""
+        @memoize
+        def double(n):
+            return 2 * n
+
+        cases = [Case("plain", abs, [1, 2, 3]), Case("cold", double, [4, 5], "cold")]
+        options = {"repeat": 5, "warmup": 0, "min_time": 0}
+        merged = run_parallel(cases, workers=2, **options)
+        serial = run(cases, **options)
+        cells = [(r["case"], r["input"], r["mode"]) for r in serial]
+        self.assertEqual([(r["case"], r["input"], r["mode"]) for r in merged], cells)
+        self.assertTrue(all(len(r["samples"]) == 5 for r in merged))
+
+    def test_markdown_table(self):
+        """Check the report table layout."""
+        table = markdown_table([10, 20], {"A": [1, 2.5], "B": [3, 4]})
+        self.assertEqual(table.splitlines(), ["| n | A | B |", "|---:|---:|---:|",
+                                              "| 10 | 1.00 | 3.00 |", "| 20 | 2.50 | 4.00 |"])
+        # The single-call table has no n column
+        table = markdown_table(["Time (µs)"], {"A": [1], "B": [2]}, "")
+        self.assertEqual(table.splitlines()[0], "| | A | B |")
+        self.assertEqual(table.splitlines()[2], "| Time (µs) | 1.00 | 2.00 |")
+        self.assertTrue(html_table(["Time (µs)"], {"A": [1]}, "").startswith("<table>\n<tr><th></th><th>A</th>"))
+
+    def test_import_is_lazy(self):
+        """Verify that importing main does not import matplotlib."""
+        self.assertNotIn("matplotlib.pyplot", sys.modules)
+        __import__("main")
+        self.assertNotIn("matplotlib.pyplot", sys.modules)
+
+    @unittest.skipUnless(HAS_MATPLOTLIB, "matplotlib is not installed")
+    def test_write_report(self):
+        """Write an HTML report with an SVG plot without a display."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_report(directory, [10, 20], {"A": [1, 2]}, {"A": 1.5}, "svg", "html")
+            with open(path, encoding="utf-8") as f:
+                report = f.read()
+            self.assertIn("<td>1.50</td>", report)
+            self.assertIn('src="factorial.svg"', report)
+            self.assertTrue(os.path.getsize(os.path.join(directory, "factorial.svg")))
+
+unittest.main(argv=[''], verbosity=2, exit=False)
@@ -0,0 +1,216 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import metrics
+from cache import memoize, LRUCache, LFUCache, SQLiteCache
+
+class TestMemoize(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        """Check that repeated calls are served from the cache and counted."""
+        calls = []
+
+        @memoize
+        def square(n):
+            calls.append(n)
+            return n * n
+
+        self.assertEqual(square(4), 16)
+        self.assertEqual(square(4), 16)
+        self.assertEqual(square(n=4), 16)
+        self.assertEqual(calls, [4, 4])
+        info = square.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize), (1, 2, None, 2))
+
+    def test_cache_clear(self):
+        """Verify that cache_clear empties the cache and resets statistics."""
+        @memoize
+        def fact(n):
+            return 1 if n < 2 else n * fact(n - 1)
+
+        self.assertEqual(fact(10), 3628800)
+        self.assertEqual(fact.cache_info().currsize, 10)
+        fact.cache_clear()
+        self.assertEqual(fact.cache_info(), (0, 0, None, 0))
+        self.assertEqual(fact.__name__, "fact")
+
+    def test_lru_bound(self):
+        """Check that the least recently used entry is evicted."""
+        cache = LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c"), len(cache)), (1, 3, 2))
+
+    def test_lfu_bound(self):
+        """Check that the least frequently used entry is evicted."""
+        cache = LFUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        cache.set("d", 4)
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual((cache.get("a"), cache.get("d"), len(cache)), (1, 4, 2))
+
+    def test_bounded_decorator(self):
+        """Ensure that a bounded cache never grows beyond maxsize."""
+        for policy in ("lru", "lfu"):
+            @memoize(maxsize=3, policy=policy)
+            def double(n):
+                return 2 * n
+
+            for n in range(10):
+                self.assertEqual(double(n), 2 * n)
+            self.assertEqual(double.cache_info().currsize, 3)
+        with self.assertRaises(ValueError):
+            memoize(policy="fifo")
+
+    def test_ttl(self):
+        """Check that expired entries are computed again."""
+        calls = []
+
+        @memoize(ttl=0.05)
+        def value(n):
+            calls.append(n)
+            return n
+
+        value(1)
+        value(1)
+        time.sleep(0.1)
+        value(1)
+        self.assertEqual(calls, [1, 1])
+
+    def test_threads(self):
+        """Verify consistent statistics under concurrent calls."""
+        @memoize(maxsize=50)
+        def square(n):
+            return n * n
+
+        def work():
+            for n in range(100):
+                self.assertEqual(square(n % 60), (n % 60) ** 2)
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = square.cache_info()
+        self.assertEqual(info.hits + info.misses, 800)
+        self.assertLessEqual(info.currsize, 50)
+
+    def test_bottom_up(self):
+        """Ensure that a cold call far above the recursion limit works."""
+        @memoize(bottom_up=True)
+        def total(n):
+            return 0 if n == 0 else n + total(n - 1)
+
+        n = sys.getrecursionlimit() * 3
+        self.assertEqual(total(n), n * (n + 1) // 2)
+        self.assertEqual(total.cache_info().currsize, n + 1)
+        total.cache_clear()
+        self.assertEqual(total(10), 55)
+        # The inner calls of the fill are not hits
+        self.assertEqual(total.cache_info()[:2], (0, 11))
+        self.assertEqual(total(10), 55)
+        self.assertEqual(total.cache_info()[:2], (1, 11))
+        self.assertEqual(total(n + 5), (n + 5) * (n + 6) // 2)
+
+    def test_bottom_up_evicted(self):
+        """Check that the bottom-up fill restarts below evicted or expired values."""
+        @memoize(maxsize=10, bottom_up=True)
+        def total(n):
+            return 0 if n == 0 else n + total(n - 1)
+
+        n = sys.getrecursionlimit() * 3
+        self.assertEqual(total(n), n * (n + 1) // 2)
+        self.assertEqual(total(n // 2), (n // 2) * (n // 2 + 1) // 2)
+        self.assertEqual(total.cache_info().currsize, 10)
+
+        @memoize(ttl=0.05, bottom_up=True)
+        def expiring(n):
+            return 0 if n == 0 else n + expiring(n - 1)
+
+        self.assertEqual(expiring(n), n * (n + 1) // 2)
+        time.sleep(0.1)
+        self.assertEqual(expiring(n + 5), (n + 5) * (n + 6) // 2)
+        with self.assertRaises(ValueError):
+            memoize(maxsize=1, bottom_up=True)
+
+    def test_custom_backend(self):
+        """Check that a backend without maxsize works with cache_info and metrics."""
+        class DictBackend:
+            def __init__(self):
+                self.data = {}
+
+            def __len__(self):
+                return len(self.data)
+
+            def get(self, key, default=None):
+                return self.data.get(key, default)
+
+            def set(self, key, value):
+                self.data[key] = value
+
+            def delete(self, key):
+                self.data.pop(key, None)
+
+            def clear(self):
+                self.data.clear()
+
+        @memoize(backend=DictBackend())
+        def cube(n):
+            return n ** 3
+
+        self.assertEqual(cube(3), 27)
+        self.assertEqual(cube(3), 27)
+        info = cube.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize), (1, 1, None, 1))
+        self.assertEqual(metrics.snapshot()[metrics.qualified_name(cube)]["entries"], 1)
+        self.assertIn("lab5_cache_entries", metrics.prometheus())
+
+    def test_sqlite_backend(self):
+        """Check that results survive a restart and are stored per namespace."""
+        calls = []
+
+        def fact(n, scale=1):
+            calls.append(n)
+            res = scale
+            for k in range(2, n + 1):
+                res *= k
+            return res
+
+        big = fact(300)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "memo.db")
+            first_store = SQLiteCache(path, "fact")
+            first = memoize(fact, backend=first_store)
+            self.assertEqual((first(300), first(3, scale=-1), first(0)), (big, -6, 1))
+            first_store.close()
+
+            # A new store on the same file plays the restarted process
+            store = SQLiteCache(path, "fact")
+            second = memoize(fact, backend=store)
+            calls.clear()
+            self.assertEqual((second(300), second(3, scale=-1), second(0)), (big, -6, 1))
+            self.assertEqual(calls, [])
+            self.assertEqual(second.cache_info(), (3, 0, None, 3))
+
+            other = SQLiteCache(path, "other")
+            other.set((1,), [1, "a"])
+            self.assertEqual(other.get((1,)), [1, "a"])
+            second.cache_clear()
+            self.assertEqual((len(store), len(other)), (0, 1))
+            store.close()
+            other.close()
+
+unittest.main(argv=[''], verbosity=2, exit=False)
\ No newline at end of file
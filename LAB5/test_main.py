@@ -0,0 +1,103 @@
+import contextlib
+import importlib.util
+import io
+import math
+import sys
+import threading
+import unittest
+from main import (PrefixFactorial, fact_binary_split, fact_prime_swing, fact_recursive_memo,
+                  fact_batch, main)
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+class TestFactorial(unittest.TestCase):
+
+    def test_prefix_values(self):
+        """Check the prefix-reuse engine against math.factorial in any call order."""
+        fact = PrefixFactorial(step=4)
+        for n in [0, 1, 5, 3, 17, 16, 9, 40, 2, 33]:
+            self.assertEqual(fact(n), math.factorial(n))
+
+    def test_prefix_checkpoints(self):
+        """Verify that a sweep keeps only the largest value and every step-th factorial."""
+        fact = PrefixFactorial(step=10)
+        for n in range(10, 300, 10):
+            fact(n)
+        self.assertEqual(fact.top_n, 290)
+        self.assertEqual(len(fact.checkpoints), 30)
+        self.assertEqual(fact.checkpoints[7], math.factorial(70))
+        fact.clear()
+        self.assertEqual(fact.checkpoints, [1])
+
+    def test_prefix_threads(self):
+        """Check that concurrent callers extending the same engine get exact values."""
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            for _ in range(3):
+                fact = PrefixFactorial(step=4)
+                wrong = []
+
+                def worker(offset):
+                    # Interleaved increasing sweeps, so the threads keep extending the top
+                    for n in range(offset, 2000, 3):
+                        if fact(n) != math.factorial(n):
+                            wrong.append(n)
+
+                threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+                self.assertEqual(wrong, [])
+                self.assertEqual(fact.checkpoints, [math.factorial(i * 4) for i in range(len(fact.checkpoints))])
+        finally:
+            sys.setswitchinterval(interval)
+
+    def test_prefix_negative(self):
+        """Ensure that negative n is rejected."""
+        with self.assertRaises(ValueError):
+            PrefixFactorial()(-1)
+
+    def test_fast_factorials(self):
+        """Check binary splitting and prime swing against math.factorial."""
+        for n in list(range(100)) + [255, 256, 1000, 4097]:
+            self.assertEqual(fact_binary_split(n), math.factorial(n))
+            self.assertEqual(fact_prime_swing(n), math.factorial(n))
+        for func in (fact_binary_split, fact_prime_swing):
+            with self.assertRaises(ValueError):
+                func(-1)
+
+    def test_recursive_memo_cold(self):
+        """Check that the recursive memoized factorial has no recursion depth limit."""
+        fact_recursive_memo.cache_clear()
+        n = sys.getrecursionlimit() + 500
+        self.assertEqual(fact_recursive_memo(n), math.factorial(n))
+        fact_recursive_memo.cache_clear()
+
+    @unittest.skipUnless(HAS_NUMPY, "requires numpy")
+    def test_batch(self):
+        """Check exact batch factorials keep the order and shape of the queries."""
+        result = fact_batch([[5, 0, 30], [5, 100, 1]])
+        self.assertEqual(result.shape, (2, 3))
+        self.assertEqual(result.tolist(), [[120, 1, math.factorial(30)],
+                                           [120, math.factorial(100), 1]])
+        self.assertEqual(fact_batch([]).size, 0)
+        with self.assertRaises(ValueError):
+            fact_batch([3, -1])
+        with self.assertRaises(TypeError):
+            fact_batch([1.5])
+
+    @unittest.skipUnless(HAS_NUMPY, "requires numpy")
+    def test_batch_log(self):
+        """Check log factorials for dense and sparse queries against lgamma."""
+        for ns in ([0, 1, 7, 50, 7], [3, 10 ** 9]):
+            for n, value in zip(ns, fact_batch(ns, log=True)):
+                self.assertAlmostEqual(value, math.lgamma(n + 1), delta=1e-9 * max(1, value))
+
+    def test_metrics_workers(self):
+        """Ensure that --metrics is rejected with worker processes, whose calls would be lost."""
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            main(["--no-show", "--metrics", "metrics.prom", "--workers", "2"])
+
+unittest.main(argv=[''], verbosity=2, exit=False)
\ No newline at end of file
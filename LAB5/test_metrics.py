@@ -0,0 +1,131 @@
+import os
+import sys
+import threading
+import time
+import types
+import unittest
+import metrics
+from cache import memoize
+from metrics import track
+
+@track
+def countdown(n):
+    return 0 if n == 0 else countdown(n - 1)
+
+@memoize
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+FIB = metrics.qualified_name(fib)
+COUNTDOWN = metrics.qualified_name(countdown)
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics.disable()
+        metrics.reset()
+        fib.cache_clear()
+
+    def tearDown(self):
+        metrics.disable()
+
+    def test_disabled(self):
+        """Check that nothing is recorded while instrumentation is off."""
+        countdown(5)
+        fib(10)
+        self.assertIsNone(sys.getprofile())
+        self.assertEqual(metrics.snapshot()[FIB]["calls"], 0)
+        self.assertNotIn(COUNTDOWN, metrics.snapshot())
+
+    def test_memoized(self):
+        """Verify calls, hits, misses and stored values of a memoized function."""
+        metrics.enable()
+        start = time.perf_counter()
+        fib(30)
+        elapsed = time.perf_counter() - start
+        fib(30)
+        metrics.disable()
+        stats = metrics.snapshot()[FIB]
+        self.assertEqual((stats["misses"], stats["hits"], stats["calls"]), (31, 29, 60))
+        self.assertEqual(stats["entries"], 31)
+        self.assertEqual(stats["stored_bytes"], sum(sys.getsizeof(fib(n)) for n in range(31)))
+        # The outermost call only, the nested misses are not added again
+        self.assertLessEqual(stats["seconds"], elapsed)
+
+    def test_tracked(self):
+        """Check that tracked plain functions are counted while enabled only."""
+        metrics.enable()
+        countdown(20)
+        metrics.disable()
+        countdown(20)
+        stats = metrics.snapshot()[COUNTDOWN]
+        self.assertEqual((stats["calls"], stats["hits"], stats["misses"]), (21, 0, 0))
+        self.assertGreater(stats["seconds"], 0)
+        self.assertIsNone(sys.getprofile())
+
+    def test_prometheus(self):
+        """Check the text exposition format."""
+        metrics.enable()
+        fib(3)
+        metrics.disable()
+        text = metrics.prometheus()
+        self.assertIn("# TYPE lab5_cache_hits_total counter\n", text)
+        self.assertIn(f'lab5_cache_hits_total{{function="{FIB}"}} 1\n', text)
+        self.assertIn(f'lab5_cache_entries{{function="{FIB}"}} 4\n', text)
+
+    def test_previous_hooks(self):
+        """Check that disable puts back the profile hooks installed before enable."""
+        seen = []
+
+        def other(frame, event, arg):
+            seen.append(event)
+
+        sys.setprofile(other)
+        threading.setprofile(other)
+        try:
+            metrics.enable()
+            metrics.enable()
+            countdown(3)
+            metrics.disable()
+            self.assertIs(sys.getprofile(), other)
+            self.assertIs(threading.getprofile(), other)
+        finally:
+            sys.setprofile(None)
+            threading.setprofile(None)
+        self.assertEqual(metrics.snapshot()[COUNTDOWN]["calls"], 4)
+
+    def test_same_qualname(self):
+        """Verify that same-named functions of different modules are counted apart."""
+        def make(module):
+            def square(n):
+                return n * n
+            square.__module__ = module
+            return memoize(square)
+
+        first, second = make("first"), make("second")
+        metrics.enable()
+        first(2)
+        second(2)
+        second(2)
+        metrics.disable()
+        data = metrics.snapshot()
+        self.assertEqual(data[metrics.qualified_name(first)]["calls"], 1)
+        self.assertEqual(data[metrics.qualified_name(second)]["calls"], 2)
+
+    def test_names(self):
+        """Check that explicit names and scripts are reported under their module."""
+        def square(n):
+            return n * n
+
+        self.assertEqual(metrics.qualified_name(square, "sq"), f"{__name__}.sq")
+        script = types.ModuleType("__main__")
+        script.__file__ = os.path.join("lab", "prog.py")
+        script.__spec__ = None
+        main, sys.modules["__main__"] = sys.modules["__main__"], script
+        try:
+            square.__module__ = "__main__"
+            self.assertEqual(metrics.qualified_name(square), "prog.TestMetrics.test_names.<locals>.square")
+        finally:
+            sys.modules["__main__"] = main
+
+unittest.main(argv=[''], verbosity=2, exit=False)